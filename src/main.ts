@@ -14,43 +14,84 @@ import { fileURLToPath } from 'url';
 import typia, { type tags } from 'typia';
 import {
     type SceneFrameScores,
+    type PooledFrame,
+    type PooledSecond,
     type Configuration,
 } from './types/Configuration/Configuration.js';
 import {
     MetricType,
-    type MetricValue,
     type ButteraugliValue,
+    type VMAFValue,
     type BaseMetric,
     type SSIMULACRA2Metric,
     type ButteraugliMetric,
+    type RegionOfInterest,
 } from './types/Configuration/Metric.js';
 import {
     type MetrologistEvent,
+    type LadderReport,
+    type PoolingReport,
     type Status,
     type ScoringStatus,
     type ErrorStatus,
     State,
 } from './types/Status.js';
+import { BoundedHeap } from './utils/BoundedHeap.js';
+import { RingBuffer } from './utils/RingBuffer.js';
+import {
+    type ScoreStatisticsSummary,
+    RunningStatistics,
+    calculateFrameScore,
+    summarizeScores,
+} from './utils/Statistics.js';
 
 export * from './types/Configuration/Configuration.js';
 export * from './types/Configuration/Import.js';
 export * from './types/Configuration/Metric.js';
 export * from './types/Status.js';
+export * from './utils/BoundedHeap.js';
+export * from './utils/RingBuffer.js';
+export * from './utils/Statistics.js';
+
+/**
+ * Statistics of the frame scores of every scene of a distorted input and metric
+ */
+export type MetricStatistics = {
+    scenes: ScoreStatisticsSummary[];
+    statistics: ScoreStatisticsSummary;
+};
 
 export class Metrologist extends EventEmitter<MetrologistEvent> {
+    /**
+     * Number of most recent statuses kept by default
+     */
+    public static readonly StatusCapacity = 1000;
+
     private childProcess?: ChildProcessByStdio<Writable | null, Readable, Readable | null>;
 
-    constructor(public config: Configuration, public readonly statuses: Status[] = [{ time: new Date(), state: State.Idle }]) {
+    /**
+     * Most recent statuses, bounded so memory stays constant however many frames are scored
+     */
+    public readonly statusBuffer: RingBuffer<Status>;
+
+    // Frame score aggregates per distorted input, metric, and scene, updated as scores arrive without keeping the scores themselves
+    private sceneStatistics: { [distortedId: string]: { [metric: string]: { scenes: RunningStatistics[]; statistics: RunningStatistics } } } = {};
+    private scoreTimes = { count: 0, first: Infinity, last: -Infinity };
+    private statisticsStale = true;
+
+    constructor(public config: Configuration, statuses: Iterable<Status> = [{ time: new Date(), state: State.Idle }], statusCapacity = Metrologist.StatusCapacity) {
         super();
 
+        this.statusBuffer = new RingBuffer(statusCapacity, statuses);
+
         // Config dates are strings, convert to Date objects
         this.config.scenes = this.config.scenes.map(scene => ({
-            reference: scene.reference,
+            ...scene,
             distorted: Object.entries(scene.distorted).reduce((distorted, [id, distortedConfig]) => {
                 distorted[id] = {
                     ...distortedConfig,
                     scores: Object.entries(distortedConfig.scores).reduce((scores, [metric, score]) => {
-                        scores[metric as MetricType] = score.map(sceneFrameScore => ({
+                        scores[metric as MetricType] = score.map(sceneFrameScore => sceneFrameScore && ({
                             ...sceneFrameScore,
                             time: new Date(sceneFrameScore.time),
                         }));
@@ -68,19 +109,22 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
         console.log('Validation:', validation.success);
 
         // Populate statuses with scores if statuses is empty and config has score data
-        if (this.statuses.length <= 1) {
-            // Generate status for each scored frame
+        if (this.statusBuffer.length <= 1) {
+            // Generate status for each scored frame, only the most recent are kept
             const scoreEvents = this.config.scenes.reduce((events, scene, sceneIndex) => {
                 Object.entries(scene.distorted).forEach(([distortedId, distorted]) => {
-                    Object.entries(distorted.scores).forEach(([metric, scores], index) => {
+                    Object.entries(distorted.scores).forEach(([metric, scores]) => {
                         if (scores) {
-                            scores.forEach(score => {
+                            scores.forEach((score, frameIndex) => {
+                                if (!score) {
+                                    return;
+                                }
                                 events.push({
                                     time: score.time,
                                     state: State.Scoring,
                                     distortedId,
                                     sceneIndex,
-                                    frameIndex: index,
+                                    frameIndex,
                                     metric: metric as MetricType,
                                     score: score.value,
                                 });
@@ -90,10 +134,10 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
                 });
 
                 return events;
-            }, [] as Status[]);
+            }, new BoundedHeap<ScoringStatus>(statusCapacity, (a, b) => a.time.getTime() - b.time.getTime()));
 
-            // Sort events by time
-            this.statuses.push(...scoreEvents.sort((a, b) => a.time.getTime() - b.time.getTime()));
+            // Only the kept events are sorted by time
+            scoreEvents.toSortedArray().forEach(event => this.statusBuffer.push(event));
         }
     }
 
@@ -210,49 +254,38 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
         }, { completed: 0, remaining: 0 });
     }
 
-    public static CalculateStatistics(config: Configuration) {
-        // TODO: Refactor to utils module
-        type SceneStatistics = {
-            scores: number[];
-            average: number;
-            minimum: number;
-            maximum: number;
-            standardDeviation: number;
-            median: number;
-            percentile1: number;
-            percentile5: number;
-        };
-
-        function generateStatistics(scores: number[]) {
-            const average = scores.reduce((sum, score) => sum + score, 0) / scores.length;
-            const minimum = Math.min(...scores.map(score => score));
-            const maximum = Math.max(...scores.map(score => score));
-
-            // Calculate the squared differences between each score and the average
-            const squaredDifferences = scores.map(score => Math.pow(score - average, 2));
-            // Calculate the average of the squared differences
-            const averageSquaredDifference = squaredDifferences.reduce((sum, difference) => sum + difference, 0) / scores.length;
-            // Calculate the standard deviation by taking the square root of the average squared difference
-            const standardDeviation = Math.sqrt(averageSquaredDifference);
-
-            const sortedScores = scores.sort((a, b) => a - b);
-
-            function calculatePercentile(percentile: number) {
-                const index = (percentile / 100) * (sortedScores.length - 1);
-                const lowerIndex = Math.floor(index);
-                const upperIndex = Math.ceil(index);
-                const lower = sortedScores[lowerIndex] ?? 0;
-                const upper = sortedScores[upperIndex] ?? 0;
-                return lowerIndex === upperIndex ? sortedScores[lowerIndex] : lower + (upper - lower) * (index - lowerIndex);
+    /**
+     * Weights of the regions of a frame score, from the regions of interest of the scene or else of the metric
+     */
+    public static GetRegionWeights(config: Configuration, scene: Configuration['scenes'][0], metric: MetricType) {
+        // Regions of interest of the scene replace those of the metric
+        const rois = scene.rois ?? config.metrics[metric]?.regions?.rois;
+        const area = config.metrics[metric]?.regions?.letterbox ? scene.letterbox : undefined;
+        return rois?.map(roi => {
+            // Regions of interest entirely within the letterbox bars do not count towards the frame average, the same disjoint test as intersect_region
+            if (area && (roi.left + roi.width <= area.left || area.left + area.width <= roi.left || roi.top + roi.height <= area.top || area.top + area.height <= roi.top)) {
+                return 0;
             }
+            return roi.weight ?? 1;
+        });
+    }
 
-            return {
-                average,
-                minimum,
-                maximum,
-                standardDeviation,
-                percentile: (percentile: number) => calculatePercentile(percentile),
-            };
+    /**
+     * Frame scores of a distorted input and metric in a scene, excluding frames skipped by a metric proxy
+     */
+    public static CalculateFrameScores(config: Configuration, scene: Configuration['scenes'][0], distortedId: string, metric: MetricType) {
+        const scores = scene.distorted[distortedId]?.scores[metric] ?? [];
+        const weights = Metrologist.GetRegionWeights(config, scene, metric);
+
+        // Frames skipped by a metric proxy have no full score
+        return scores
+            .filter(score => !!score && !score.skipped)
+            .map((score: SceneFrameScores | SceneFrameScores<ButteraugliValue> | SceneFrameScores<VMAFValue>) => calculateFrameScore(metric, score.value, weights));
+    }
+
+    public static CalculateStatistics(config: Configuration) {
+        function generateStatistics(scores: number[]) {
+            return summarizeScores(RunningStatistics.From(scores), scores);
         }
 
         // Statistics must be calculated per metric per distorted
@@ -266,21 +299,8 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
 
         config.scenes.forEach(scene => {
             Object.entries(scene.distorted).forEach(([distortedId, distorted]) => {
-                Object.entries(distorted.scores).forEach(([metric, scores]) => {
-                    const scenesScores = scores.map((score: SceneFrameScores | SceneFrameScores<ButteraugliValue>) => {
-                        if (Array.isArray(score.value)) {
-                            const allScores = score.value.flat();
-                            return allScores.reduce((sum, regionScore) => {
-                                if (metric === MetricType.Butteraugli) {
-                                    // Default to using NormInfinite - Consider using Norm2 when metric implementation is HIP/CUDA
-                                    return sum + (regionScore as ButteraugliValue).NormInfinite;
-                                }
-                                return sum + (regionScore as MetricValue);
-                            }, 0) / allScores.length;
-                        } else {
-                            return score.value;
-                        }
-                    });
+                Object.keys(distorted.scores).forEach(metric => {
+                    const scenesScores = Metrologist.CalculateFrameScores(config, scene, distortedId, metric as MetricType);
 
                     if (!metricScenesMap[distortedId]) {
                         metricScenesMap[distortedId] = {};
@@ -299,36 +319,13 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
                     result[distortedId] = {};
                 }
 
-                const allScores = scores.flat();
-
                 result[distortedId][metric] = {
-                    scenes: scores.map(scores => {
-                        const generatedStatistics = generateStatistics(scores);
-                        return {
-                            scores,
-                            minimum: generatedStatistics.minimum,
-                            maximum: generatedStatistics.maximum,
-                            average: generatedStatistics.average,
-                            standardDeviation: generatedStatistics.standardDeviation,
-                            median: generatedStatistics.percentile(50),
-                            percentile1: generatedStatistics.percentile(1),
-                            percentile5: generatedStatistics.percentile(5),
-                        } as SceneStatistics;
-                    }),
-                    statistics: {
-                        scores: allScores,
-                        minimum: Math.min(...allScores),
-                        maximum: Math.max(...allScores),
-                        average: allScores.reduce((sum, score) => sum + score, 0) / allScores.length,
-                        standardDeviation: generateStatistics(allScores).standardDeviation,
-                        median: generateStatistics(allScores).percentile(50),
-                        percentile1: generateStatistics(allScores).percentile(1),
-                        percentile5: generateStatistics(allScores).percentile(5),
-                    } as SceneStatistics,
+                    scenes: scores.map(scores => generateStatistics(scores)),
+                    statistics: generateStatistics(scores.flat()),
                 };
             });
             return result;
-        }, {} as { [distortedId: string]: { [metric: string]: { scenes: SceneStatistics[]; statistics: SceneStatistics; } } });
+        }, {} as { [distortedId: string]: { [metric: string]: MetricStatistics } });
     }
 
     public static CalculateFramerate(config: Configuration, metric?: MetricType) {
@@ -337,7 +334,8 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
                 Object.values(scene.distorted).forEach((distorted) => {
                     Object.entries(distorted.scores).forEach(([sceneMetric, scores]) => {
                         if (!metric || sceneMetric === metric) {
-                            frameTimes = frameTimes.concat(scores.filter(score => !!score).map(score => score.time));
+                            // Frames skipped by a metric proxy were not fully scored
+                            frameTimes = frameTimes.concat(scores.filter(score => !!score && !score.skipped).map(score => score.time));
                         }
                     });
                 });
@@ -350,7 +348,7 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
         const firstFrameTime = frameTimes[0]?.getTime();
         const totalSeconds = frameTimes.length > 1 && lastFrameTime && firstFrameTime ? (lastFrameTime - firstFrameTime) / 1000 : 0;
 
-        return frameTimes.length / totalSeconds;
+        return totalSeconds > 0 ? frameTimes.length / totalSeconds : 0;
     }
 
     public get totalFrames() {
@@ -365,12 +363,100 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
         return Metrologist.CalculateTotalFramesScored(this.config);
     }
 
+    /**
+     * Most recent statuses, oldest first
+     *
+     * Statuses are kept in `statusBuffer`, so pushing to the returned array does not add a status
+     */
+    public get statuses() {
+        return this.statusBuffer.toArray();
+    }
+
+    /**
+     * Statistics of every distorted input and metric, updated as frames are scored
+     *
+     * Only the running aggregates are kept between reads, the scores, median, and percentiles are computed from the scores of the config when read
+     */
     public get statistics() {
-        return Metrologist.CalculateStatistics(this.config);
+        this.updateStatistics();
+
+        return Object.entries(this.sceneStatistics).reduce((result, [distortedId, metricsMap]) => {
+            result[distortedId] = Object.entries(metricsMap).reduce((metricsResult, [metric, { scenes, statistics }]) => {
+                const scenesScores = this.config.scenes.map(scene => Metrologist.CalculateFrameScores(this.config, scene, distortedId, metric as MetricType));
+                metricsResult[metric] = {
+                    scenes: scenesScores.map((scores, sceneIndex) => summarizeScores(scenes[sceneIndex] ?? new RunningStatistics(), scores)),
+                    statistics: summarizeScores(statistics, scenesScores.flat()),
+                };
+                return metricsResult;
+            }, {} as { [metric: string]: MetricStatistics });
+            return result;
+        }, {} as { [distortedId: string]: { [metric: string]: MetricStatistics } });
     }
 
+    /**
+     * Frames fully scored per second, excluding frames skipped by a metric proxy, or 0 until two frames are scored
+     */
     public get framerate() {
-        return Metrologist.CalculateFramerate(this.config);
+        this.updateStatistics();
+
+        const { count, first, last } = this.scoreTimes;
+        const totalSeconds = count > 1 ? (last - first) / 1000 : 0;
+
+        return totalSeconds > 0 ? count / totalSeconds : 0;
+    }
+
+    /**
+     * Standard input of the running measurement, for streaming a `y4m` input with the path `-`
+     */
+    public get stdin() {
+        return this.childProcess?.stdin ?? undefined;
+    }
+
+    /**
+     * Add a frame score to the running statistics
+     */
+    private aggregateScore(sceneIndex: number, distortedId: string, metric: MetricType, score: SceneFrameScores) {
+        // Frames skipped by a metric proxy have no full score
+        const scene = this.config.scenes[sceneIndex];
+        if (!scene || score.skipped) {
+            return;
+        }
+
+        const time = score.time.getTime();
+        this.scoreTimes.count++;
+        this.scoreTimes.first = Math.min(this.scoreTimes.first, time);
+        this.scoreTimes.last = Math.max(this.scoreTimes.last, time);
+
+        const frameScore = calculateFrameScore(metric, score.value, Metrologist.GetRegionWeights(this.config, scene, metric));
+        const metricsMap = this.sceneStatistics[distortedId] ?? (this.sceneStatistics[distortedId] = {});
+        const metricStatistics = metricsMap[metric] ?? (metricsMap[metric] = { scenes: [], statistics: new RunningStatistics() });
+        const sceneStatistics = metricStatistics.scenes[sceneIndex] ?? (metricStatistics.scenes[sceneIndex] = new RunningStatistics());
+        sceneStatistics.add(frameScore);
+        metricStatistics.statistics.add(frameScore);
+    }
+
+    /**
+     * Rebuild the running statistics from every score of the config when scores were replaced rather than added
+     */
+    private updateStatistics() {
+        if (!this.statisticsStale) {
+            return;
+        }
+
+        this.sceneStatistics = {};
+        this.scoreTimes = { count: 0, first: Infinity, last: -Infinity };
+        this.config.scenes.forEach((scene, sceneIndex) => {
+            Object.entries(scene.distorted).forEach(([distortedId, distorted]) => {
+                Object.entries(distorted.scores).forEach(([metric, scores]) => {
+                    scores.forEach(score => {
+                        if (score) {
+                            this.aggregateScore(sceneIndex, distortedId, metric as MetricType, score);
+                        }
+                    });
+                });
+            });
+        });
+        this.statisticsStale = false;
     }
 
     private addStatus(status: Omit<Status, 'time'> & Partial<Pick<Status, 'time'>>) {
@@ -378,13 +464,18 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
             time: status.time ?? new Date(),
             ...status,
         } as Status;
-        this.statuses.push(newStatus);
+        this.statusBuffer.push(newStatus);
         this.emit('status', newStatus);
         // eslint-disable-next-line @typescript-eslint/no-explicit-any
         this.emit(status.state, newStatus as any);
     }
 
     public async measure() {
+        // Temporal pooling is recomputed from every frame score on each run
+        if (this.config.pooling) {
+            this.config.scenes.forEach(scene => Object.values(scene.distorted).forEach(distorted => delete distorted.pooling));
+        }
+
         // Write config file to disk
         await fsp.writeFile(this.configPath, JSON.stringify(Metrologist.Serialize(this.config), null, 4));
 
@@ -411,18 +502,17 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
                             scene: sceneIndex,
                             distortedId,
                             frame,
-                            metric: metricType,
+                            metric,
                             score,
                         } = JSON.parse(scoreJson) as {
                             scene: number;
                             distortedId: string;
                             frame: number;
-                            metric: keyof typeof MetricType;
+                            metric: MetricType;
                             score: SceneFrameScores;
                         };
 
                         const time = new Date(score.time);
-                        const metric = MetricType[metricType as keyof typeof MetricType];
 
                         if (sceneIndex > this.config.scenes.length) {
                             return;
@@ -439,13 +529,26 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
 
                         if (!this.config.scenes[sceneIndex].distorted[distortedId].scores[metric].length || this.config.scenes[sceneIndex].distorted[distortedId].scores[metric].length < sceneLength) {
                             this.config.scenes[sceneIndex].distorted[distortedId].scores[metric] = new Array(sceneLength).fill(undefined);
+                            this.statisticsStale = true;
                         }
 
-                        this.config.scenes[sceneIndex].distorted[distortedId].scores[metric][frame] = {
+                        const sceneFrameScore = {
                             time,
                             value: score.value,
+                            ...(score.proxy !== undefined && { proxy: score.proxy }),
+                            ...(score.skipped && { skipped: score.skipped }),
+                            ...(score.reused && { reused: score.reused }),
                         } as SceneFrameScores;
 
+                        // Aggregates cannot remove a replaced score, so they are rebuilt when next read
+                        if (this.config.scenes[sceneIndex].distorted[distortedId].scores[metric][frame]) {
+                            this.statisticsStale = true;
+                        }
+                        this.config.scenes[sceneIndex].distorted[distortedId].scores[metric][frame] = sceneFrameScore;
+                        if (!this.statisticsStale) {
+                            this.aggregateScore(sceneIndex, distortedId, metric, sceneFrameScore);
+                        }
+
                         // Add new status with the state 'scoring'
                         this.addStatus({
                             time,
@@ -460,6 +563,96 @@ export class Metrologist extends EventEmitter<MetrologistEvent> {
                         console.error(error);
                         return;
                     }
+                } else if (line.startsWith('POOL:')) {
+                    // Parse temporally pooled scores
+                    const poolJson = line.substring('POOL: '.length);
+                    try {
+                        const {
+                            scene: sceneIndex,
+                            distortedId,
+                            metric,
+                            window,
+                            frame,
+                            second,
+                        } = JSON.parse(poolJson) as {
+                            scene: number;
+                            distortedId: string;
+                            metric: MetricType;
+                            window: number;
+                            frame?: PooledFrame;
+                            second?: PooledSecond;
+                        };
+
+                        const distorted = this.config.scenes[sceneIndex]?.distorted[distortedId];
+                        if (!distorted) {
+                            return;
+                        }
+
+                        // Add pooled scores to config
+                        distorted.pooling = distorted.pooling ?? {};
+                        const pooling = distorted.pooling[metric] ?? (distorted.pooling[metric] = { window, frames: [], seconds: [] });
+                        if (frame) {
+                            pooling.frames.push(frame);
+                        }
+                        if (second) {
+                            pooling.seconds.push(second);
+                        }
+
+                        this.emit('pooling', {
+                            sceneIndex,
+                            distortedId,
+                            metric,
+                            window,
+                            ...(frame && { frame }),
+                            ...(second && { second }),
+                        } as PoolingReport);
+                    } catch (error) {
+                        console.error(error);
+                        return;
+                    }
+                } else if (line.startsWith('LETTERBOX:')) {
+                    // Parse the picture area detected in a scene
+                    const letterboxJson = line.substring('LETTERBOX: '.length);
+                    try {
+                        const {
+                            scene: sceneIndex,
+                            letterbox,
+                        } = JSON.parse(letterboxJson) as {
+                            scene: number;
+                            letterbox: RegionOfInterest;
+                        };
+
+                        const scene = this.config.scenes[sceneIndex];
+                        if (!scene) {
+                            return;
+                        }
+
+                        // Add picture area to config, which changes the weights of the regions of interest of the scene
+                        scene.letterbox = letterbox;
+                        this.statisticsStale = true;
+                    } catch (error) {
+                        console.error(error);
+                        return;
+                    }
+                } else if (line.startsWith('LADDER:')) {
+                    // Parse the combined report of a ladder
+                    const ladderJson = line.substring('LADDER: '.length);
+                    try {
+                        const ladderReport = JSON.parse(ladderJson) as LadderReport;
+
+                        const ladder = this.config.ladders?.[ladderReport.ladderId];
+                        if (!ladder) {
+                            return;
+                        }
+
+                        // Add rungs to config
+                        ladder.rungs = ladderReport.rungs;
+
+                        this.emit('ladder', ladderReport);
+                    } catch (error) {
+                        console.error(error);
+                        return;
+                    }
                 } else {
                     if (this.config.output?.verbose) {
                         console.log(`[Metrologist] ${line}`);
@@ -1,17 +1,55 @@
+from __future__ import annotations
 import argparse
-from asyncio import Task, run, create_task, gather, as_completed, to_thread
-from dataclasses import asdict, dataclass, is_dataclass
+from asyncio import Condition, Future, Task, run, create_task, gather, as_completed, get_running_loop, to_thread
+from collections import deque
+import copy
+from dataclasses import asdict, dataclass, field, is_dataclass
 import datetime
 from enum import Enum
+from fractions import Fraction
 from functools import reduce
+import gc
+import hashlib
 import json
+import math
 import os
+import socket
+import sqlite3
 import sys
 import subprocess
+import tempfile
+import threading
 import time
-from typing import Any, Dict, List, Tuple, Union
-import vapoursynth
-from vapoursynth import core
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+
+# VapourSynth is required to measure videos, but not to read exported results with ResultsReader
+try:
+    import vapoursynth
+    from vapoursynth import core
+except ImportError:
+    vapoursynth = None
+    core = None
+
+# NumPy is only required for metrics computed without a VapourSynth plugin
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# psutil is only used to measure memory usage on platforms without /proc
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# PyArrow is only required to export and read results as Arrow IPC or Parquet files
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 # region Types
 
@@ -23,6 +61,7 @@ class ImportMethod:
     BESTSOURCE = 'bestsource'
     LSMASH = 'lsmash'
     FFMS2 = 'ffms2'
+    Y4M = 'y4m'
 
 @dataclass(frozen=True)
 class FFMS2Resizer:
@@ -170,6 +209,18 @@ class BestSourceImport:
     start_number: int | None = None
     showprogress: bool | None = None
 
+@dataclass(frozen=True)
+class Y4MImport:
+    """YUV4MPEG2 stream import method configuration
+
+    Reads frames in order from stdin (-), a FIFO, or a TCP socket (tcp://host:port) while they are produced
+    """
+    type: ImportMethod = ImportMethod.Y4M # type: ignore
+    # Number of frames in the stream. Defaults to the end of the last scene.
+    frames: int | None = None
+    # Number of decoded frames held in memory
+    buffer: int | None = None
+
 # endregion Import Methods
 
 # region Metrics
@@ -181,6 +232,32 @@ class MetricType(Enum):
     VMAF = 'VMAF'
     Butteraugli = 'Butteraugli'
     XPSNR = 'XPSNR'
+    SSIM = 'SSIM'
+    MS_SSIM = 'MS-SSIM'
+
+@dataclass(frozen=True)
+class RegionOfInterest:
+    """
+    A rectangle of the frame to compute the metric on, in pixels of the reference video after scaling
+
+    Attributes
+    ---
+        left: int
+            The horizontal offset of the rectangle
+        top: int
+            The vertical offset of the rectangle
+        width: int
+            The width of the rectangle
+        height: int
+            The height of the rectangle
+        weight: float | None
+            The weight of the rectangle when averaging the regions of a frame. Defaults to 1.
+    """
+    left: int
+    top: int
+    width: int
+    height: int
+    weight: float | None = None
 
 @dataclass(frozen=True)
 class MetricRegions:
@@ -190,6 +267,8 @@ class MetricRegions:
     The entire frame is divided into a grid of regions by rows and columns.
     Each region is a rectangular area with size of approximately (frame height / rows) x
     (frame width / columns).
+    When regions of interest are given, only those rectangles are computed instead of the grid,
+    as a single row with one column per rectangle.
 
     Attributes
     ---
@@ -197,9 +276,41 @@ class MetricRegions:
             The number of rows to divide the frame into.
         columns: int
             The number of columns to divide the frame into.
+        rois: List[RegionOfInterest] | None
+            The rectangles to compute instead of the grid
+        letterbox: bool | None
+            Whether to detect letterbox and pillarbox bars on the reference video of each scene and exclude them
+            from the grid or regions of interest
+    """
+    rows: int = 1
+    columns: int = 1
+    rois: List[RegionOfInterest] | None = None
+    letterbox: bool | None = None
+
+@dataclass(frozen=True)
+class MetricProxy:
     """
-    rows: int
-    columns: int
+    Define a cheap first pass used to select which frames are scored with the full metric
+
+    Every frame is first scored with the proxy metric on the whole frame, optionally on a downscaled copy of the inputs.
+    Only frames with a proxy score worse than the threshold or within the worst percentage of proxy scores are then
+    scored with the full metric. When neither threshold nor worst is set, every frame is fully scored.
+
+    Attributes
+    ---
+        metric: MetricType | None
+            The metric to compute in the first pass. Defaults to the metric itself.
+        scale: float | None
+            The factor to downscale the reference and distorted videos by for the first pass, e.g. 0.25.
+        threshold: float | None
+            Frames with a proxy score worse than this value are fully scored.
+        worst: float | None
+            The percentage of frames with the worst proxy scores that are fully scored.
+    """
+    metric: MetricType | None = None
+    scale: float | None = None
+    threshold: float | None = None
+    worst: float | None = None
 
 class Metric:
     """
@@ -209,18 +320,21 @@ class Metric:
     ---
         regions: MetricRegions | None
             The regions of each frame to compute the metric
+        proxy: MetricProxy | None
+            The first pass used to select which frames are fully scored
         
     Methods
     ---
-        __init__(self, regions: MetricRegions | None = None)
-            Initialize the metric with the given regions
+        __init__(self, regions: MetricRegions | None = None, proxy: MetricProxy | None = None)
+            Initialize the metric with the given regions and proxy
     """
     regions: MetricRegions | None
+    proxy: MetricProxy | None
 
-    def __init__(self, regions: MetricRegions | None = None):
+    def __init__(self, regions: MetricRegions | None = None, proxy: MetricProxy | None = None):
         self.regions = regions
+        self.proxy = proxy
 
-@dataclass(frozen=True)
 class PSNRMetric(Metric):
     """
     Peak signal-to-noise ratio (PSNR)
@@ -247,6 +361,7 @@ class SSIMULACRA2Implementation(Enum):
     CPU = 'cpu'
     CUDA = 'cuda'
     HIP = 'hip'
+    AUTO = 'auto'
 
 class SSIMULACRA2Metric(Metric):
     """
@@ -255,18 +370,19 @@ class SSIMULACRA2Metric(Metric):
     Multiple implementations are available: CPU, CUDA and HIP.
     CUDA and HIP require a compatible Graphics Processing Unit (GPU) and the [VapourSynth-HIP](https://github.com/Line-fr/Vship) plugin to be installed.
     CPU requires either the [vapoursynth-julek-plugin](https://github.com/dnjulek/vapoursynth-julek-plugin) or [VapourSynth Zig Image Process](https://github.com/dnjulek/vapoursynth-zip) plugin to be installed.
+    AUTO benchmarks every installed plugin at startup and uses the fastest one whose scores agree with the others.
 
     Attributes
     ---
         regions: MetricRegions | None
             The regions of each frame to compute the metric
         implementation: SSIMULACRA2Implementation
-            The implementation to use for the metric. Can be CUDA, HIP, or CPU.
+            The implementation to use for the metric. Can be CUDA, HIP, CPU, or AUTO.
     """
     implementation: SSIMULACRA2Implementation | None
 
-    def __init__(self, implementation: SSIMULACRA2Implementation | None,  regions: MetricRegions | None = None):
-        super().__init__(regions)
+    def __init__(self, implementation: SSIMULACRA2Implementation | None = None,  regions: MetricRegions | None = None, proxy: MetricProxy | None = None):
+        super().__init__(regions, proxy)
         match implementation:
             case SSIMULACRA2Implementation.CPU.value:
                 self.implementation = SSIMULACRA2Implementation.CPU
@@ -274,24 +390,72 @@ class SSIMULACRA2Metric(Metric):
                 self.implementation = SSIMULACRA2Implementation.CUDA
             case SSIMULACRA2Implementation.HIP.value:
                 self.implementation = SSIMULACRA2Implementation.HIP
+            case SSIMULACRA2Implementation.AUTO.value:
+                self.implementation = SSIMULACRA2Implementation.AUTO
             case _:
                 self.implementation = None
 
+class VMAFModel(Enum):
+    # Values are the libvmaf model names, mapped to the model indices of the VapourSynth-VMAF plugin by VMAF_MODEL_INDEX
+    VMAF_V061 = 'vmaf_v0.6.1'
+    VMAF_V061_NEG = 'vmaf_v0.6.1neg'
+    VMAF_B_V063 = 'vmaf_b_v0.6.3'
+    VMAF_4K_V061 = 'vmaf_4k_v0.6.1'
+
+class VMAFFeature(Enum):
+    # Values are the libvmaf feature names, mapped to the feature indices of the VapourSynth-VMAF plugin by VMAF_FEATURE_INDEX
+    PSNR = 'psnr'
+    PSNR_HVS = 'psnr_hvs'
+    SSIM = 'ssim'
+    MS_SSIM = 'ms_ssim'
+    CIEDE2000 = 'ciede2000'
+
+VMAF_MODEL_INDEX = {
+    VMAFModel.VMAF_V061: 0,
+    VMAFModel.VMAF_V061_NEG: 1,
+    VMAFModel.VMAF_B_V063: 2,
+    VMAFModel.VMAF_4K_V061: 3,
+}
+
+VMAF_FEATURE_INDEX = {
+    VMAFFeature.PSNR: 0,
+    VMAFFeature.PSNR_HVS: 1,
+    VMAFFeature.SSIM: 2,
+    VMAFFeature.MS_SSIM: 3,
+    VMAFFeature.CIEDE2000: 4,
+}
+
 class VMAFMetric(Metric):
     """
     [VMAF](https://github.com/Netflix/vmaf) - Video Multimethod Assessment Fusion (VMAF)
 
+    Requires the [VapourSynth-VMAF](https://github.com/HomeOfVapourSynthEvolution/VapourSynth-VMAF) plugin to be installed.
+    Each region is scored in a single libvmaf pass over the whole scene, which also reports the elementary features
+    (VIF, ADM, motion) of the model and any additional features per frame.
+    If PSNR is also measured with the same regions, it is extracted from the same pass instead of running libvmaf twice.
+
     Attributes
     ---
         regions: MetricRegions | None
             The regions of each frame to compute the metric
+        model: VMAFModel | None
+            The model to score with. Defaults to vmaf_v0.6.1.
+        features: List[VMAFFeature] | None
+            Additional features to compute in the same pass, such as PSNR or SSIM
     """
-    pass
+    model: VMAFModel
+    features: List[VMAFFeature]
+
+    def __init__(self, regions: MetricRegions | None = None, model: VMAFModel | None = None, features: List[VMAFFeature] | None = None, proxy: MetricProxy | None = None):
+        super().__init__(regions, proxy)
+        self.model = VMAFModel(model) if model is not None else VMAFModel.VMAF_V061
+        self.features = [VMAFFeature(feature) for feature in features] if features is not None else []
 
 class ButteraugliImplementation(Enum):
     CUDA = 'cuda'
     HIP = 'hip'
     CPU = 'cpu'
+    AUTO = 'auto'
 
 class ButteraugliMetric(Metric):
     """
@@ -301,6 +465,7 @@ class ButteraugliMetric(Metric):
     CUDA and HIP require a compatible Graphics Processing Unit (GPU) and the [VapourSynth-HIP](https://github.com/Line-fr/Vship) plugin to be installed.
     CPU requires the [vapoursynth-julek-plugin](https://github.com/dnjulek/vapoursynth-julek-plugin) plugin to be installed.
     If the [VapourSynth-HIP](https://github.com/Line-fr/Vship) plugin is not available, the implementation will be set to CPU.
+    AUTO benchmarks every installed plugin at startup and uses the fastest one whose scores agree with the others.
     VapourSynth-HIP returns results in 2Norm, 3Norm, and INFNorm. Currently, it is set to return results in INFNorm.
     CPU only returns results in INFNorm.
 
@@ -309,7 +474,7 @@ class ButteraugliMetric(Metric):
         regions: MetricRegions | None
             The regions of each frame to compute the metric
         implementation: ButteraugliImplementation
-            The implementation to use for the metric. Can be CUDA, HIP, or CPU.
+            The implementation to use for the metric. Can be CUDA, HIP, CPU, or AUTO.
         intensity_target: int | None
             The viewing condition in nits 
         linput: bool | None
@@ -318,8 +483,8 @@ class ButteraugliMetric(Metric):
     intensity_target: int | None
     linput: bool | None
 
-    def __init__(self, regions: MetricRegions | None = None, implementation: ButteraugliImplementation | None = None, intensity_target: int | None = None, linput: bool | None = None):
-        super().__init__(regions)
+    def __init__(self, regions: MetricRegions | None = None, implementation: ButteraugliImplementation | None = None, intensity_target: int | None = None, linput: bool | None = None, proxy: MetricProxy | None = None):
+        super().__init__(regions, proxy)
 
         match implementation:
             case ButteraugliImplementation.CUDA.value:
@@ -328,6 +493,8 @@ class ButteraugliMetric(Metric):
                 self.implementation = ButteraugliImplementation.HIP
             case ButteraugliImplementation.CPU.value:
                 self.implementation = ButteraugliImplementation.CPU
+            case ButteraugliImplementation.AUTO.value:
+                self.implementation = ButteraugliImplementation.AUTO
             case _:
                 self.implementation = None
 
@@ -345,6 +512,41 @@ class XPSNRMetric(Metric):
     """
     pass
 
+class SSIMMetric(Metric):
+    """
+    Structural similarity (SSIM) of the luma plane
+
+    Computed with [NumPy](https://numpy.org) using an 11x11 Gaussian window (sigma 1.5) and requires no VapourSynth plugin.
+
+    Attributes
+    ---
+        regions: MetricRegions | None
+            The regions of each frame to compute the metric
+        batch: int | None
+            The number of frames to score per call. Defaults to 8.
+    """
+    batch: int | None
+
+    def __init__(self, regions: MetricRegions | None = None, batch: int | None = None, proxy: MetricProxy | None = None):
+        super().__init__(regions, proxy)
+        self.batch = batch
+
+class MSSSIMMetric(SSIMMetric):
+    """
+    Multi-scale structural similarity (MS-SSIM) of the luma plane
+
+    Computed with [NumPy](https://numpy.org) over up to 5 scales and requires no VapourSynth plugin.
+    Regions too small for all 5 scales use as many scales as fit.
+
+    Attributes
+    ---
+        regions: MetricRegions | None
+            The regions of each frame to compute the metric
+        batch: int | None
+            The number of frames to score per call. Defaults to 8.
+    """
+    pass
+
 # endregion Metrics
 
 @dataclass(frozen=True)
@@ -355,8 +557,10 @@ class InputScale:
 @dataclass(frozen=True)
 class Input:
     path: str
-    importMethods: List[Union[FFMS2Import, LSMASHImport, DGDecNVImport, BestSourceImport]]
+    importMethods: List[Union[FFMS2Import, LSMASHImport, DGDecNVImport, BestSourceImport, Y4MImport]]
     scale: InputScale | None = None
+    # Encoder build that produced a distorted video, used to compare builds in the results database
+    encoder: str | None = None
 
 @dataclass(frozen=True)
 class SceneFrames:
@@ -369,6 +573,15 @@ class ButteraugliValue:
     Norm3: float
     NormInfinite: float
 
+@dataclass
+class VMAFValue:
+    """
+    VMAF score of a region and the per-frame values of every feature libvmaf reported, such as
+    integer_vif_scale0, integer_adm2, integer_motion2, psnr_y, or float_ssim
+    """
+    score: float
+    features: Dict[str, float]
+
 @dataclass
 class MetricScore:
     """
@@ -378,31 +591,209 @@ class MetricScore:
     ----------
         time: datetime.datetime
             Datetime when the score was calculated
-        value: list[list[float | ButteraugliValue | None]]
+        value: list[list[float | ButteraugliValue | VMAFValue | None]]
             2D array of region scores, where the first dimension is the row and the second dimension is the column
+        proxy: float | None
+            Whole frame score of the metric proxy, if the metric has one
+        skipped: bool | None
+            Whether the metric proxy excluded the frame from full scoring
+        reused: bool | None
+            Whether the score was reused from an earlier frame with identical reference and distorted fingerprints
     """
     time: datetime.datetime
-    value: list[list[float | ButteraugliValue | None]]
+    value: list[list[float | ButteraugliValue | VMAFValue | None]]
+    proxy: float | None = None
+    skipped: bool | None = None
+    reused: bool | None = None
+
+@dataclass
+class PooledSecond:
+    """
+    Aggregate of the frame scores within one second of the reference video
+
+    Attributes
+    ----------
+        second: int
+            Index of the second from the start of the reference video
+        frames: int
+            Number of scored frames within the second
+        average: float
+            Average frame score within the second
+        minimum: float
+            Minimum frame score within the second
+        maximum: float
+            Maximum frame score within the second
+    """
+    second: int
+    frames: int
+    average: float
+    minimum: float
+    maximum: float
+
+@dataclass
+class PooledFrame:
+    """
+    Aggregate of the frame scores within the sliding window ending at a frame
+
+    Attributes
+    ----------
+        frame: int
+            Index of the last frame of the window within the scene
+        minimum: float
+            Minimum frame score within the window
+        maximum: float
+            Maximum frame score within the window
+        average: float
+            Average frame score within the window
+    """
+    frame: int
+    minimum: float
+    maximum: float
+    average: float
+
+@dataclass
+class TemporalPooling:
+    """
+    Temporally pooled scores of a metric for a scene
+
+    Attributes
+    ----------
+        window: int
+            Number of frames in the sliding window
+        frames: list[PooledFrame]
+            Sliding window aggregates for each frame whose window contains at least one scored frame
+        seconds: list[PooledSecond]
+            Aggregates of the frame scores for each second, aligned to the reference framerate
+    """
+    window: int
+    frames: list[PooledFrame]
+    seconds: list[PooledSecond]
 
 @dataclass(frozen=True)
 class SceneFramesWithScores(SceneFrames):
     scores: Dict[MetricType, List[MetricScore]]
+    pooling: Dict[MetricType, TemporalPooling] = field(default_factory=dict)
 
-@dataclass(frozen=True)
+@dataclass
 class Scene:
     reference: SceneFrames
     distorted: Dict[str, SceneFramesWithScores]
+    # Regions of interest of this scene, replacing the regions of every metric
+    rois: List[RegionOfInterest] | None = None
+    # Picture area of the reference video without letterbox and pillarbox bars, detected once for metrics with letterbox detection
+    letterbox: RegionOfInterest | None = None
 
 @dataclass(frozen=True)
 class Wamp:
     host: str
     realm: str
 
+class ExportFormat(Enum):
+    ARROW = 'arrow'
+    PARQUET = 'parquet'
+    NPY = 'npy'
+
+@dataclass(frozen=True)
+class ExportOutput:
+    """
+    Columnar export of the per-frame, per-region scores with one row per region of a frame and one column per metric or norm
+
+    Attributes
+    ---
+        path: str
+            Path of the exported file
+        format: ExportFormat | None
+            File format. Defaults to the format matching the file extension, or Arrow IPC.
+            Arrow and Parquet require PyArrow and fall back to a NumPy structured array (.npy) when it is not installed.
+    """
+    path: str
+    format: ExportFormat | None = None
+
 @dataclass(frozen=True)
 class Output:
     path: str | None
     console: bool | None
     verbose: bool | None
+    export: ExportOutput | None = None
+    # Path of a SQLite database that accumulates frame scores across runs
+    database: str | None = None
+
+@dataclass(frozen=True)
+class Pooling:
+    """
+    Temporal pooling of frame scores, computed as frames are scored
+
+    Attributes
+    ---
+        window: int | None
+            Number of frames in the sliding window. Defaults to one second of frames at the reference framerate.
+        frames: bool | None
+            Whether to store the sliding window aggregates of every frame in addition to the per-second aggregates. Defaults to true.
+    """
+    window: int | None = None
+    frames: bool | None = None
+
+class DeduplicationMode(Enum):
+    EXACT = 'exact'
+    LUMA = 'luma'
+
+@dataclass(frozen=True)
+class Deduplication:
+    """
+    Reuse metric scores for frames whose reference and distorted fingerprints match an earlier scored frame
+
+    Attributes
+    ---
+        mode: DeduplicationMode
+            How frames are fingerprinted. EXACT hashes every plane at full resolution, while LUMA hashes
+            the luma plane downscaled to 64x64 at 8 bits, which also matches nearly identical frames.
+    """
+    mode: DeduplicationMode = DeduplicationMode.EXACT
+
+class LadderResolution(Enum):
+    NATIVE = 'native'
+    DISPLAY = 'display'
+
+@dataclass
+class LadderRung:
+    """
+    Combined report of a rendition of a ladder
+
+    Attributes
+    ---
+        distortedId: str
+            Identifier of the distorted video input of the rendition
+        width: int
+            Width of the rendition as imported
+        height: int
+            Height of the rendition as imported
+        scores: Dict[MetricType, float]
+            Average frame score of each metric over every scene of the rendition, excluding frames skipped by a metric proxy
+    """
+    distortedId: str
+    width: int
+    height: int
+    scores: Dict[MetricType, float] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class Ladder:
+    """
+    Renditions of an adaptive bitrate ladder scored against the same reference video
+
+    Attributes
+    ---
+        renditions: List[str]
+            Identifiers of the distorted video inputs of the ladder
+        resolution: LadderResolution
+            NATIVE scores each rendition at its own resolution against the reference video downscaled to it, while DISPLAY
+            scores each rendition upscaled to the resolution of the reference video. Each reference size is built once and
+            shared by every rendition and metric.
+        rungs: List[LadderRung]
+            Combined report of every rendition from the highest to the lowest resolution, recomputed on each run
+    """
+    renditions: List[str]
+    resolution: LadderResolution = LadderResolution.DISPLAY
+    rungs: List[LadderRung] = field(default_factory=list)
 
 @dataclass(frozen=True)
 class Configuration:
@@ -413,6 +804,10 @@ class Configuration:
     scenes: List[Scene]
     output: Output
     threads: int | None
+    pooling: Pooling | None = None
+    memoryBudget: int | None = None
+    deduplication: Deduplication | None = None
+    ladders: Dict[str, Ladder] | None = None
 
 @dataclass(frozen=True)
 class ScoreReport:
@@ -422,6 +817,25 @@ class ScoreReport:
     metric: MetricType
     score: MetricScore
 
+@dataclass(frozen=True)
+class PoolReport:
+    scene: int
+    distortedId: str
+    metric: MetricType
+    window: int
+    frame: PooledFrame | None
+    second: PooledSecond | None
+
+@dataclass(frozen=True)
+class LadderReport:
+    ladderId: str
+    rungs: List[LadderRung]
+
+@dataclass(frozen=True)
+class LetterboxReport:
+    scene: int
+    letterbox: RegionOfInterest
+
 # Library value must be the name of the plugin as found on the VapourSynth Core
 class Library(Enum):
     DGDecodeNV = 'dgdecodenv'
@@ -438,6 +852,45 @@ class Library(Enum):
 
 # region Utility Functions
 
+def create_metric(metric_type: MetricType, options: Dict[str, Any]) -> Metric | None:
+    options = dict(options)
+    if 'regions' in options:
+        regions = dict(options['regions'])
+        if 'rois' in regions:
+            regions['rois'] = [RegionOfInterest(**roi) for roi in regions['rois']]
+        options['regions'] = MetricRegions(**regions)
+    if 'features' in options:
+        options['features'] = [VMAFFeature(feature) for feature in options['features']]
+    if 'proxy' in options:
+        proxy = dict(options['proxy'])
+        if 'metric' in proxy:
+            proxy['metric'] = MetricType(proxy['metric'])
+        options['proxy'] = MetricProxy(**proxy)
+        # A proxy of the metric itself on full size inputs would score every frame twice
+        if (options['proxy'].metric in (None, metric_type) and (options['proxy'].scale is None or options['proxy'].scale >= 1)):
+            raise ValueError(f"The proxy of {metric_type.value} must use another metric or a scale below 1")
+        # libvmaf only reports scores for every frame of a scene in order, so VMAF cannot score a first pass
+        if ((options['proxy'].metric or metric_type) == MetricType.VMAF):
+            raise ValueError(f"The proxy of {metric_type.value} cannot use VMAF")
+
+    if metric_type == MetricType.PSNR:
+        return PSNRMetric(**options)
+    elif metric_type == MetricType.SSIMULACRA:
+        return SSIMULACRAMetric(**options)
+    elif metric_type == MetricType.SSIMULACRA2:
+        return SSIMULACRA2Metric(**options)
+    elif metric_type == MetricType.VMAF:
+        return VMAFMetric(**options)
+    elif metric_type == MetricType.Butteraugli:
+        return ButteraugliMetric(**options)
+    elif metric_type == MetricType.XPSNR:
+        return XPSNRMetric(**options)
+    elif metric_type == MetricType.SSIM:
+        return SSIMMetric(**options)
+    elif metric_type == MetricType.MS_SSIM:
+        return MSSSIMMetric(**options)
+    return None
+
 def deserialize_config(json_path: str) -> Configuration:
     with open(json_path, 'r') as f:
         data = json.load(f)
@@ -454,6 +907,8 @@ def deserialize_config(json_path: str) -> Configuration:
                 return DGDecNVImport(**method)
             elif method_type == ImportMethod.BESTSOURCE:
                 return BestSourceImport(**method)
+            elif method_type == ImportMethod.Y4M:
+                return Y4MImport(**method)
             else:
                 raise ValueError(f"Unknown import method type: {method_type}")
 
@@ -472,27 +927,16 @@ def deserialize_config(json_path: str) -> Configuration:
             path=value['path'],
             importMethods=parse_import_methods(value['importMethods']),
             scale=InputScale(**value['scale']) if 'scale' in value else None,
+            encoder=value['encoder'] if 'encoder' in value else None,
         )
         for key, value in data['distorted'].items()
     }
 
     metrics = {}
     for key, value in data['metrics'].items():
-        if 'regions' in value:
-            value['regions'] = MetricRegions(**value['regions'])
-
-        if key == MetricType.PSNR.value:
-            metrics[MetricType[key]] = PSNRMetric(**value)
-        elif key == MetricType.SSIMULACRA.value:
-            metrics[MetricType[key]] = SSIMULACRAMetric(**value)
-        elif key == MetricType.SSIMULACRA2.value:
-            metrics[MetricType[key]] = SSIMULACRA2Metric(**value)
-        elif key == MetricType.VMAF.value:
-            metrics[MetricType[key]] = VMAFMetric(**value)
-        elif key == MetricType.Butteraugli.value:
-            metrics[MetricType[key]] = ButteraugliMetric(**value)
-        elif key == MetricType.XPSNR.value:
-            metrics[MetricType[key]] = XPSNRMetric(**value)
+        metric = create_metric(MetricType(key), value)
+        if metric is not None:
+            metrics[MetricType(key)] = metric
 
     scenes = [
         Scene(
@@ -502,20 +946,32 @@ def deserialize_config(json_path: str) -> Configuration:
                     start=value['start'],
                     end=value['end'],
                     scores={
-                        MetricType[metric]: [
+                        MetricType(metric): [
                             MetricScore(
                                 time=datetime.datetime.fromisoformat(score['time']),
                                 value=[
                                     [
-                                        column if (isinstance(column, float) or isinstance(column, int) or column is None) else ButteraugliValue(**column)
+                                        column if (isinstance(column, float) or isinstance(column, int) or column is None) else VMAFValue(**column) if 'score' in column else ButteraugliValue(**column)
                                         for column in row
                                     ] for row in score['value']
-                                ]
+                                ],
+                                proxy=score['proxy'] if 'proxy' in score else None,
+                                skipped=score['skipped'] if 'skipped' in score else None,
+                                reused=score['reused'] if 'reused' in score else None,
                             ) for score in value['scores'][metric]
                         ] for metric in value['scores']
-                    }
+                    },
+                    pooling={
+                        MetricType(metric): TemporalPooling(
+                            window=pooling['window'],
+                            frames=[PooledFrame(**frame) for frame in pooling['frames']],
+                            seconds=[PooledSecond(**second) for second in pooling['seconds']],
+                        ) for metric, pooling in value['pooling'].items()
+                    } if 'pooling' in value else {},
                 ) for key, value in scene['distorted'].items()
-            }
+            },
+            rois=[RegionOfInterest(**roi) for roi in scene['rois']] if 'rois' in scene else None,
+            letterbox=RegionOfInterest(**scene['letterbox']) if 'letterbox' in scene else None,
         ) for scene in data['scenes']
     ]
 
@@ -523,6 +979,11 @@ def deserialize_config(json_path: str) -> Configuration:
         path=data['output']['path'],
         console=data['output']['console'] if 'console' in data['output'] else True,
         verbose=data['output']['verbose'] if 'verbose' in data['output'] else False,
+        export=ExportOutput(
+            path=data['output']['export']['path'],
+            format=ExportFormat(data['output']['export']['format']) if 'format' in data['output']['export'] else None,
+        ) if 'export' in data['output'] else None,
+        database=data['output']['database'] if 'database' in data['output'] else None,
     )
 
     if 'threads' in data:
@@ -530,6 +991,51 @@ def deserialize_config(json_path: str) -> Configuration:
     else:
         threads = None
 
+    pooling = Pooling(**data['pooling']) if 'pooling' in data else None
+    memory_budget = data['memoryBudget'] if 'memoryBudget' in data else None
+    deduplication = Deduplication(mode=DeduplicationMode(data['deduplication']['mode']) if 'mode' in data['deduplication'] else DeduplicationMode.EXACT) if 'deduplication' in data else None
+
+    ladders = {
+        key: Ladder(
+            renditions=value['renditions'],
+            resolution=LadderResolution(value['resolution']) if 'resolution' in value else LadderResolution.DISPLAY,
+            rungs=[
+                LadderRung(
+                    distortedId=rung['distortedId'],
+                    width=rung['width'],
+                    height=rung['height'],
+                    scores={MetricType(metric): score for metric, score in rung['scores'].items()} if 'scores' in rung else {},
+                ) for rung in value['rungs']
+            ] if 'rungs' in value else [],
+        )
+        for key, value in data['ladders'].items()
+    } if 'ladders' in data else None
+
+    # Every rendition must be a distorted video input scored at a single resolution
+    ladder_resolutions: Dict[str, LadderResolution] = {}
+    for key, ladder in (ladders or {}).items():
+        for distorted_id in ladder.renditions:
+            if (distorted_id not in distorted):
+                raise ValueError(f"Unknown distorted video input in ladder {key}: {distorted_id}")
+            if (ladder_resolutions.get(distorted_id, ladder.resolution) != ladder.resolution):
+                raise ValueError(f"Distorted video input {distorted_id} is scored at both native and display resolution")
+            ladder_resolutions[distorted_id] = ladder.resolution
+
+    # Streamed inputs only buffer a window of frames, so they must be read once, in order, by a single metric
+    for key, video_input in [('reference', reference), *distorted.items()]:
+        if (not any(isinstance(import_method, Y4MImport) for import_method in video_input.importMethods)):
+            continue
+        readers = max((len(scene.distorted) for scene in scenes), default=1) * len(metrics) if key == 'reference' else len(metrics)
+        if (readers > 1):
+            raise ValueError(f"Video input {key} is streamed with the y4m import method and can only be scored by one metric of one distorted video input")
+        for metric_type, metric in metrics.items():
+            if (metric.proxy is not None):
+                raise ValueError(f"Video input {key} is streamed with the y4m import method and cannot be scored with a proxy of {metric_type.value}")
+            if (metric.regions is not None and metric.regions.letterbox):
+                raise ValueError(f"Video input {key} is streamed with the y4m import method and cannot detect letterbox bars for {metric_type.value}")
+            if (isinstance(metric, (SSIMULACRA2Metric, ButteraugliMetric)) and metric.implementation in (SSIMULACRA2Implementation.AUTO, ButteraugliImplementation.AUTO)):
+                raise ValueError(f"Video input {key} is streamed with the y4m import method and cannot benchmark the auto implementation of {metric_type.value}")
+
     return Configuration(
         schema=schema,
         reference=reference,
@@ -538,6 +1044,10 @@ def deserialize_config(json_path: str) -> Configuration:
         scenes=scenes,
         output=output,
         threads=threads,
+        pooling=pooling,
+        memoryBudget=memory_budget,
+        deduplication=deduplication,
+        ladders=ladders,
     )
 
 # Custom JSON Encoder
@@ -588,7 +1098,158 @@ def serialize_config(config: Configuration) -> str:
 def serialize_score_report(score_report: ScoreReport) -> str:
     return json.dumps(asdict(score_report), cls=ConfigurationEncoder)
 
-def import_video(path: str, import_methods: List[Union[FFMS2Import, LSMASHImport, DGDecNVImport, BestSourceImport]]) -> vapoursynth.VideoNode:
+def serialize_pool_report(pool_report: PoolReport) -> str:
+    return json.dumps(asdict(pool_report), cls=ConfigurationEncoder)
+
+def serialize_letterbox_report(letterbox_report: LetterboxReport) -> str:
+    return json.dumps(letterbox_report, cls=ConfigurationEncoder)
+
+def serialize_ladder_report(ladder_report: LadderReport) -> str:
+    return json.dumps({
+        'ladderId': ladder_report.ladderId,
+        'rungs': [{**asdict(rung), 'scores': {metric_type.value: score for metric_type, score in rung.scores.items()}} for rung in ladder_report.rungs],
+    }, cls=ConfigurationEncoder)
+
+def open_stream(path: str) -> Any:
+    """
+    Open a binary stream from stdin (-), a TCP socket (tcp://host:port, waiting for the producer to connect), or a file or FIFO.
+    """
+    if (path == '-'):
+        return sys.stdin.buffer
+    if (path.startswith('tcp://')):
+        host, port = path[len('tcp://'):].rsplit(':', 1)
+        with socket.create_server((host, int(port))) as server:
+            print(f'Waiting for a connection on {path}...')
+            connection, _address = server.accept()
+        return connection.makefile('rb')
+    return open(path, 'rb')
+
+class Y4MStream:
+    """
+    Read YUV4MPEG2 frames from a stream on a background thread into a bounded ring buffer
+
+    The reader fills the buffer ahead of the requested frames and only evicts the oldest frame
+    once a frame past the end of the buffer is requested, so memory is bounded by the buffer and
+    a producer writing to a pipe is paused while the buffer is full.
+    """
+    # Color family, bit depth, and chroma subsampling (horizontal, vertical) of each supported YUV4MPEG2 colorspace
+    COLORSPACES = {
+        '420jpeg': ('YUV', 8, 1, 1),
+        '420paldv': ('YUV', 8, 1, 1),
+        '420mpeg2': ('YUV', 8, 1, 1),
+        '420': ('YUV', 8, 1, 1),
+        '420p10': ('YUV', 10, 1, 1),
+        '420p12': ('YUV', 12, 1, 1),
+        '420p14': ('YUV', 14, 1, 1),
+        '420p16': ('YUV', 16, 1, 1),
+        '422': ('YUV', 8, 1, 0),
+        '422p10': ('YUV', 10, 1, 0),
+        '422p12': ('YUV', 12, 1, 0),
+        '422p14': ('YUV', 14, 1, 0),
+        '422p16': ('YUV', 16, 1, 0),
+        '444': ('YUV', 8, 0, 0),
+        '444p10': ('YUV', 10, 0, 0),
+        '444p12': ('YUV', 12, 0, 0),
+        '444p14': ('YUV', 14, 0, 0),
+        '444p16': ('YUV', 16, 0, 0),
+        '411': ('YUV', 8, 2, 0),
+        'mono': ('GRAY', 8, 0, 0),
+        'mono10': ('GRAY', 10, 0, 0),
+        'mono12': ('GRAY', 12, 0, 0),
+        'mono16': ('GRAY', 16, 0, 0),
+    }
+
+    def __init__(self, path: str, capacity: int):
+        self.path = path
+        self.capacity = max(1, capacity)
+        self.source = open_stream(path)
+
+        header = self.source.readline().decode('ascii').split()
+        if (len(header) == 0 or header[0] != 'YUV4MPEG2'):
+            raise ValueError(f'{path} is not a YUV4MPEG2 stream')
+        parameters = {token[0]: token[1:] for token in header[1:]}
+        self.width = int(parameters['W'])
+        self.height = int(parameters['H'])
+        self.fps = Fraction(*map(int, parameters['F'].split(':'))) if 'F' in parameters else Fraction(25, 1)
+
+        # Colorspaces default to 420jpeg, other tags such as 444alpha have no matching VapourSynth format
+        colorspace = parameters.get('C', '420jpeg')
+        if (colorspace not in self.COLORSPACES):
+            raise ValueError(f"Unsupported YUV4MPEG2 colorspace C{colorspace} in {path}, supported colorspaces are {', '.join(self.COLORSPACES)}")
+        family, bits, subsampling_w, subsampling_h = self.COLORSPACES[colorspace]
+        self.format = core.query_video_format(getattr(vapoursynth, family), vapoursynth.INTEGER, bits, subsampling_w, subsampling_h)
+
+        self.plane_shapes = [
+            (self.height >> (self.format.subsampling_h if plane > 0 else 0), self.width >> (self.format.subsampling_w if plane > 0 else 0))
+            for plane in range(self.format.num_planes)
+        ]
+        self.frame_size = sum(height * width for height, width in self.plane_shapes) * self.format.bytes_per_sample
+
+        self.frames: Dict[int, bytes] = {}
+        self.base = 0
+        self.count = 0
+        self.requested = -1
+        self.ended = False
+        self.error: Exception | None = None
+        self.condition = threading.Condition()
+        threading.Thread(target=self.read_frames, daemon=True).start()
+
+    def read_frames(self):
+        try:
+            while True:
+                line = self.source.readline()
+                if (not line):
+                    break
+                if (not line.startswith(b'FRAME')):
+                    raise ValueError(f'Invalid YUV4MPEG2 frame header in {self.path}')
+                data = self.source.read(self.frame_size)
+                if (len(data) < self.frame_size):
+                    break
+
+                with self.condition:
+                    while (len(self.frames) >= self.capacity and self.requested < self.count):
+                        self.condition.wait()
+                    if (len(self.frames) >= self.capacity):
+                        del self.frames[self.base]
+                        self.base += 1
+                    self.frames[self.count] = data
+                    self.count += 1
+                    self.condition.notify_all()
+        except Exception as error:
+            self.error = error
+        finally:
+            with self.condition:
+                self.ended = True
+                self.condition.notify_all()
+
+    def get(self, frame_index: int) -> bytes:
+        with self.condition:
+            self.requested = max(self.requested, frame_index)
+            self.condition.notify_all()
+            while (frame_index >= self.count and not self.ended):
+                self.condition.wait()
+
+            if (frame_index < self.base):
+                raise ValueError(f'Frame {frame_index} of {self.path} is no longer buffered, increase the buffer of the y4m import method')
+            if (frame_index >= self.count):
+                raise ValueError(f'{self.path} ended after {self.count} frames before frame {frame_index}{f": {self.error}" if self.error else ""}')
+            return self.frames[frame_index]
+
+    def read_frame(self, frame_index: int, frame: vapoursynth.VideoFrame) -> vapoursynth.VideoFrame:
+        data = self.get(frame_index)
+        output = frame.copy()
+        dtype = numpy.uint8 if self.format.bytes_per_sample == 1 else numpy.uint16 # type: ignore
+        offset = 0
+        for plane, (height, width) in enumerate(self.plane_shapes):
+            numpy.asarray(output[plane])[:] = numpy.frombuffer(data, dtype=dtype, count=height * width, offset=offset).reshape(height, width) # type: ignore
+            offset += height * width * self.format.bytes_per_sample
+        return output
+
+    def create_video(self, length: int) -> vapoursynth.VideoNode:
+        blank = core.std.BlankClip(width=self.width, height=self.height, format=self.format.id, length=length, fpsnum=self.fps.numerator, fpsden=self.fps.denominator, keep=True)
+        return blank.std.ModifyFrame(clips=blank, selector=lambda n, f: self.read_frame(n, f))
+
+def import_video(path: str, import_methods: List[Union[FFMS2Import, LSMASHImport, DGDecNVImport, BestSourceImport, Y4MImport]], length: int | None = None) -> vapoursynth.VideoNode:
     global installed
     _path_base, path_ext = os.path.splitext(path)
 
@@ -609,7 +1270,17 @@ def import_video(path: str, import_methods: List[Union[FFMS2Import, LSMASHImport
     else:
         # Iterate over each import method in order of preference and return the first one that succeeds
         for import_method in import_methods:
-            if (isinstance(import_method, DGDecNVImport) and installed[Library.DGDecodeNV]):
+            if (isinstance(import_method, Y4MImport)):
+                if (numpy is None):
+                    print('The y4m import method requires numpy to be installed', file=sys.stderr)
+                    continue
+                if ((import_method.frames or length) is None):
+                    raise ValueError(f'Failed to import video from {path}: the number of frames of the stream is unknown')
+
+                stream = Y4MStream(path, import_method.buffer or 120)
+                y4m_streams[path] = stream
+                return stream.create_video(import_method.frames or length) # type: ignore
+            elif (isinstance(import_method, DGDecNVImport) and installed[Library.DGDecodeNV]):
                 absolute_dgindex_path = import_method.indexPath or os.path.splitext(path)[0] + '.dgi'
 
                 try:
@@ -746,11 +1417,163 @@ def crop_video_regions(video: vapoursynth.VideoNode, rows: int, columns: int) ->
         )
     ]], range(rows), [])
 
+def get_regions_key(regions: MetricRegions | None) -> Tuple[Any, ...] | None:
+    """
+    Get a hashable key of the region configuration of a metric.
+    """
+    if (regions is None):
+        return None
+    return (regions.rows, regions.columns, tuple(regions.rois) if regions.rois is not None else None, regions.letterbox)
+
+def align_region(region: RegionOfInterest, width: int, height: int, subsampling_w: int, subsampling_h: int) -> RegionOfInterest:
+    """
+    Expand a region outwards to the chroma subsampling of the video and clip it to the frame.
+    """
+    width_alignment = 1 << subsampling_w
+    height_alignment = 1 << subsampling_h
+    left = max(0, region.left) // width_alignment * width_alignment
+    top = max(0, region.top) // height_alignment * height_alignment
+    right = min(width, -(-(region.left + region.width) // width_alignment) * width_alignment)
+    bottom = min(height, -(-(region.top + region.height) // height_alignment) * height_alignment)
+    return RegionOfInterest(left, top, max(width_alignment, right - left), max(height_alignment, bottom - top), region.weight)
+
+def intersect_region(region: RegionOfInterest, area: RegionOfInterest) -> RegionOfInterest:
+    """
+    Clip a region to an area. A region outside of the area keeps its rectangle with a weight of 0, so it is still
+    scored but does not count towards the frame average.
+    """
+    left = max(region.left, area.left)
+    top = max(region.top, area.top)
+    right = min(region.left + region.width, area.left + area.width)
+    bottom = min(region.top + region.height, area.top + area.height)
+    if (right <= left or bottom <= top):
+        return RegionOfInterest(region.left, region.top, region.width, region.height, 0.0)
+    return RegionOfInterest(left, top, right - left, bottom - top, region.weight)
+
+def divide_region(area: RegionOfInterest, rows: int, columns: int, subsampling_w: int, subsampling_h: int) -> List[List[RegionOfInterest]]:
+    """
+    Divide an area into a grid of regions aligned to chroma subsampling, where the last row and column take the remainder.
+    """
+    region_width = max(1 << subsampling_w, (area.width // columns) >> subsampling_w << subsampling_w)
+    region_height = max(1 << subsampling_h, (area.height // rows) >> subsampling_h << subsampling_h)
+    return [
+        [
+            RegionOfInterest(
+                area.left + column * region_width,
+                area.top + row * region_height,
+                region_width if column != columns - 1 else area.width - column * region_width,
+                region_height if row != rows - 1 else area.height - row * region_height,
+            )
+            for column in range(columns)
+        ]
+        for row in range(rows)
+    ]
+
+def get_region_rois(scene: Scene, metric: Metric) -> List[RegionOfInterest] | None:
+    """
+    Get the regions of interest of a metric in a scene, where those of the scene replace those of the metric.
+    """
+    if (scene.rois is not None and len(scene.rois) > 0):
+        return scene.rois
+    if (metric.regions is not None and metric.regions.rois is not None and len(metric.regions.rois) > 0):
+        return metric.regions.rois
+    return None
+
+def get_region_weights(scene: Scene, metric: Metric) -> List[List[float]] | None:
+    """
+    Get the weights of the regions of a metric in a scene, or None if every region has the same weight.
+    Regions of interest entirely within the letterbox bars detected in the scene have a weight of 0, matching
+    Metrologist.GetRegionWeights, which weights frame scores with the letterbox area reported by detect_scene_letterbox.
+    """
+    rois = get_region_rois(scene, metric)
+    if (rois is not None and metric.regions is not None and metric.regions.letterbox and scene.letterbox is not None):
+        rois = [intersect_region(roi, scene.letterbox) for roi in rois]
+    if (rois is None or all(roi.weight is None for roi in rois)):
+        return None
+    return [[roi.weight if roi.weight is not None else 1.0 for roi in rois]]
+
+def scale_region_rectangles(rectangles: List[List[RegionOfInterest]], source_width: int, source_height: int, width: int, height: int, subsampling_w: int, subsampling_h: int) -> List[List[RegionOfInterest]]:
+    """
+    Scale rectangles planned on a video of one size to a video of another size, aligned to its chroma subsampling.
+    """
+    if (source_width == width and source_height == height):
+        return rectangles
+    return [
+        [
+            align_region(
+                RegionOfInterest(
+                    rectangle.left * width // source_width,
+                    rectangle.top * height // source_height,
+                    -(-rectangle.width * width // source_width),
+                    -(-rectangle.height * height // source_height),
+                    rectangle.weight,
+                ),
+                width,
+                height,
+                subsampling_w,
+                subsampling_h,
+            )
+            for rectangle in row
+        ]
+        for row in rectangles
+    ]
+
+def crop_video_rectangles(video: vapoursynth.VideoNode, rectangles: List[List[RegionOfInterest]]) -> List[List[vapoursynth.VideoNode]]:
+    return [
+        [
+            video if (rectangle.left == 0 and rectangle.top == 0 and rectangle.width == video.width and rectangle.height == video.height) else video.std.CropAbs(rectangle.width, rectangle.height, rectangle.left, rectangle.top)
+            for rectangle in row
+        ]
+        for row in rectangles
+    ]
+
+def detect_letterbox(video: vapoursynth.VideoNode, frame_indices: List[int], matrix: int) -> RegionOfInterest:
+    """
+    Detect letterbox and pillarbox bars from the average luma of every row and column of sample frames,
+    computed by resizing the luma plane to a single column and a single row.
+
+    A row or column belongs to the picture if it is brighter than black in any sample frame.
+    The detected area is aligned to the chroma subsampling of the video. RGB video is converted to luma with the given matrix coefficients.
+    """
+    luma = extract_luma(video, matrix)
+    row_averages = luma.resize.Bilinear(width=1, height=luma.height)
+    column_averages = luma.resize.Bilinear(width=luma.width, height=1)
+
+    active_rows = [False] * luma.height
+    active_columns = [False] * luma.width
+    for frame_index in frame_indices:
+        row_frame = row_averages.get_frame(frame_index)
+        column_frame = column_averages.get_frame(frame_index)
+
+        if (luma.format.sample_type == vapoursynth.FLOAT):
+            threshold = 1 / 32
+        else:
+            peak = 1 << luma.format.bits_per_sample
+            # Limited range black is 16 at 8 bits
+            black = 0 if row_frame.props.get('_ColorRange') == 0 else peak >> 4
+            threshold = black + (peak >> 5)
+
+        for row, (value,) in enumerate(memoryview(row_frame[0]).tolist()): # type: ignore
+            active_rows[row] = active_rows[row] or value > threshold
+        for column, value in enumerate(memoryview(column_frame[0]).tolist()[0]): # type: ignore
+            active_columns[column] = active_columns[column] or value > threshold
+
+    if (not any(active_rows) or not any(active_columns)):
+        # Entirely black frames have no bars to detect
+        return RegionOfInterest(0, 0, video.width, video.height)
+
+    top = active_rows.index(True)
+    bottom = len(active_rows) - active_rows[::-1].index(True)
+    left = active_columns.index(True)
+    right = len(active_columns) - active_columns[::-1].index(True)
+    return align_region(RegionOfInterest(left, top, right - left, bottom - top), video.width, video.height, video.format.subsampling_w, video.format.subsampling_h)
+
 def retrieve_score(frame: vapoursynth.VideoFrame, metric: Metric) -> float | ButteraugliValue:
     if (isinstance(metric, PSNRMetric)):
         return frame.props['PSNR'] if 'PSNR' in frame.props else None # type: ignore
     elif (isinstance(metric, ButteraugliMetric)):
-        if (metric.implementation == ButteraugliImplementation.CUDA or metric.implementation == ButteraugliImplementation.HIP):
+        # vship reports every norm while julek only reports the infinite norm
+        if ('_BUTTERAUGLI_INFNorm' in frame.props):
             return ButteraugliValue(frame.props['_BUTTERAUGLI_2Norm'], frame.props['_BUTTERAUGLI_3Norm'], frame.props['_BUTTERAUGLI_INFNorm']) # type: ignore
         else:
             return ButteraugliValue(0, 0, frame.props['_FrameButteraugli']) # type: ignore
@@ -760,6 +1583,10 @@ def retrieve_score(frame: vapoursynth.VideoFrame, metric: Metric) -> float | But
         return frame.props['_SSIMULACRA2'] if '_SSIMULACRA2' in frame.props else None # type: ignore
     elif (isinstance(metric, XPSNRMetric)):
         return frame.props['_XPSNR'] if '_XPSNR' in frame.props else None or None # type: ignore
+    elif (isinstance(metric, MSSSIMMetric)):
+        return frame.props['_MS_SSIM'] if '_MS_SSIM' in frame.props else None # type: ignore
+    elif (isinstance(metric, SSIMMetric)):
+        return frame.props['_SSIM'] if '_SSIM' in frame.props else None # type: ignore
     else:
         raise ValueError(f'Unknown metric: {metric}')
 
@@ -775,43 +1602,460 @@ def compare_region(reference: vapoursynth.VideoNode, distorted: vapoursynth.Vide
             print('Butteraugli requires either vship or julek to be installed')
             return reference
 
-        if ((metric.implementation == ButteraugliImplementation.CUDA or metric.implementation == ButteraugliImplementation.HIP) and installed[Library.VSHIP]):
-            # vship.Butteraugli requires RGBS and linear transfer
-            ref = reference.resize.Bicubic(format=vapoursynth.RGBS, matrix_in_s='709')
-            dist = distorted.resize.Bicubic(format=vapoursynth.RGBS, matrix_in_s='709')
-            return ref.vship.BUTTERAUGLI(dist, metric.intensity_target)
-
-        return reference.julek.Butteraugli(distorted, intensity_target=metric.intensity_target, linput=metric.linput)
+        return compare_region_backend(reference, distorted, metric, select_metric_backend(MetricType.Butteraugli, metric))
     elif (isinstance(metric, SSIMULACRAMetric)):
         if (not installed[Library.Julek]):
             return reference
 
         # julek.SSIMULACRA requires RGB24
-        return reference.resize.Bicubic(format=vapoursynth.RGB24, matrix_in_s='709').julek.SSIMULACRA(distorted.resize.Bicubic(format=vapoursynth.RGB24, matrix_in_s='709'), feature=1)
+        return convert_video(reference, vapoursynth.RGB24).julek.SSIMULACRA(convert_video(distorted, vapoursynth.RGB24), feature=1)
     elif (isinstance(metric, SSIMULACRA2Metric)):
         if (not installed[Library.VSHIP] and not installed[Library.VSZip] and not installed[Library.SSIMULACRA2_ZIG]):
             print('SSIMULACRA2 requires either vship, vszip, or ssimulacra2-zig to be installed')
             return reference
 
-        # vship.SSIMULACRA2 requires RGBS and linear transfer
-        if ((metric.implementation == SSIMULACRA2Implementation.CUDA or metric.implementation == SSIMULACRA2Implementation.HIP) and installed[Library.VSHIP]):
-            reference = reference.resize.Bicubic(format=vapoursynth.RGBS, matrix_in_s='709')
-            distorted = distorted.resize.Bicubic(format=vapoursynth.RGBS, matrix_in_s='709')
-        
-        
-        return reference.vship.SSIMULACRA2(distorted) if ((metric.implementation == SSIMULACRA2Implementation.CUDA or metric.implementation == SSIMULACRA2Implementation.HIP) and installed[Library.VSHIP]) else reference.vszip.Metrics(distorted, mode=0) if installed[Library.VSZip] else reference.ssimulacra2.SSIMULACRA2(distorted)
+        return compare_region_backend(reference, distorted, metric, select_metric_backend(MetricType.SSIMULACRA2, metric))
     elif (isinstance(metric, XPSNRMetric)):
         if (not installed[Library.VSZip]):
             return reference
 
         return reference.vszip.Metrics(distorted, mode=1)
+    elif (isinstance(metric, VMAFMetric)):
+        # VMAF scores are only available from the libvmaf log, see compare_region_vmaf
+        print('VMAF can only be scored as a full metric and not as a proxy')
+        return reference
+    elif (isinstance(metric, SSIMMetric)):
+        if (numpy is None):
+            print(f'{"MS-SSIM" if isinstance(metric, MSSSIMMetric) else "SSIM"} requires numpy to be installed')
+            return reference
+
+        prop = '_MS_SSIM' if isinstance(metric, MSSSIMMetric) else '_SSIM'
+
+        def score_frame(n: int, f: List[vapoursynth.VideoFrame]) -> vapoursynth.VideoFrame:
+            reference_planes, data_range = read_luma_planes([f[0]])
+            distorted_planes, _data_range = read_luma_planes([f[1]])
+            scores = calculate_ms_ssim(reference_planes, distorted_planes, data_range) if isinstance(metric, MSSSIMMetric) else calculate_ssim(reference_planes, distorted_planes, data_range)[0]
+            output = f[0].copy()
+            output.props[prop] = float(scores[0])
+            return output
+
+        # RGB inputs are converted to luma with the matrix of the reference video
+        luma_matrix = get_luma_matrix()
+        luma_reference = extract_luma(reference, luma_matrix)
+        return luma_reference.std.ModifyFrame(clips=[luma_reference, extract_luma(distorted, luma_matrix)], selector=score_frame)
     else:
         print(f'Unsupported metric: {metric}')
         return reference
 
+def get_metric_backends(metric: Metric) -> List[Library]:
+    """
+    Get the installed plugins that can score a metric, in order of precedence.
+    """
+    if (isinstance(metric, ButteraugliMetric)):
+        backends = [Library.VSHIP, Library.Julek]
+    elif (isinstance(metric, SSIMULACRA2Metric)):
+        backends = [Library.VSHIP, Library.VSZip, Library.SSIMULACRA2_ZIG]
+    else:
+        backends = []
+    return [backend for backend in backends if installed[backend]]
+
+def select_metric_backend(metric_type: MetricType, metric: SSIMULACRA2Metric | ButteraugliMetric) -> Library | None:
+    """
+    Select the plugin to score a metric with: the benchmarked backend for the AUTO implementation,
+    vship for the CUDA and HIP implementations, and otherwise the first installed CPU plugin.
+    """
+    if (metric in selected_backends):
+        return selected_backends[metric]
+
+    backends = get_metric_backends(metric)
+    if (metric.implementation in (SSIMULACRA2Implementation.CUDA, SSIMULACRA2Implementation.HIP, ButteraugliImplementation.CUDA, ButteraugliImplementation.HIP) and Library.VSHIP in backends):
+        return Library.VSHIP
+    cpu_backends = [backend for backend in backends if backend != Library.VSHIP]
+    return cpu_backends[0] if len(cpu_backends) > 0 else (backends[0] if len(backends) > 0 else None)
+
+def compare_region_backend(reference: vapoursynth.VideoNode, distorted: vapoursynth.VideoNode, metric: SSIMULACRA2Metric | ButteraugliMetric, backend: Library | None) -> vapoursynth.VideoNode:
+    metric_format = get_backend_format(backend, reference.format, distorted.format)
+    reference = convert_video(reference, metric_format)
+    distorted = convert_video(distorted, metric_format)
+
+    if (isinstance(metric, ButteraugliMetric)):
+        if (backend == Library.VSHIP):
+            return reference.vship.BUTTERAUGLI(distorted, metric.intensity_target)
+
+        return reference.julek.Butteraugli(distorted, intensity_target=metric.intensity_target, linput=metric.linput)
+
+    if (backend == Library.VSHIP):
+        return reference.vship.SSIMULACRA2(distorted)
+
+    return reference.vszip.Metrics(distorted, mode=0) if backend == Library.VSZip else reference.ssimulacra2.SSIMULACRA2(distorted)
+
+def get_backend_format(backend: Library | None, reference_format: vapoursynth.VideoFormat, distorted_format: vapoursynth.VideoFormat) -> vapoursynth.PresetVideoFormat:
+    """
+    Get the narrowest RGB format a plugin accepts that holds both the reference and distorted formats, so the input with the
+    higher bit depth is not narrowed.
+    """
+    if (backend == Library.VSHIP or vapoursynth.FLOAT in (reference_format.sample_type, distorted_format.sample_type)):
+        # vship only accepts RGBS
+        return vapoursynth.RGBS
+    return vapoursynth.RGB24 if max(reference_format.bits_per_sample, distorted_format.bits_per_sample) <= 8 else vapoursynth.RGB48
+
+def get_metric_format(metric: Metric, reference_format: vapoursynth.VideoFormat, distorted_format: vapoursynth.VideoFormat) -> vapoursynth.PresetVideoFormat | None:
+    """
+    Get the format a metric is scored in for the formats of the reference and distorted videos, or None if the videos are scored as is.
+    """
+    if (isinstance(metric, SSIMULACRAMetric)):
+        return vapoursynth.RGB24
+    if (isinstance(metric, ButteraugliMetric)):
+        return get_backend_format(select_metric_backend(MetricType.Butteraugli, metric), reference_format, distorted_format)
+    if (isinstance(metric, SSIMULACRA2Metric)):
+        return get_backend_format(select_metric_backend(MetricType.SSIMULACRA2, metric), reference_format, distorted_format)
+    return None
+
+def convert_video(video: vapoursynth.VideoNode, video_format: vapoursynth.PresetVideoFormat | None) -> vapoursynth.VideoNode:
+    """
+    Convert a video to a format in a single resize, which upsamples chroma, converts the matrix, and changes the bit depth together.
+    The matrix and range are read from the frame properties set by tag_color_properties. Videos already in the format are returned as is.
+    """
+    if (video_format is None or video.format.id == video_format):
+        return video
+    return video.resize.Bicubic(format=video_format)
+
+def tag_color_properties(video: vapoursynth.VideoNode, defaults: Dict[str, int] | None = None) -> Tuple[vapoursynth.VideoNode, Dict[str, int]]:
+    """
+    Read the matrix, transfer, primaries, and range of a YUV video from its first frame and set the ones that are missing or unspecified
+    on every frame, so conversions use the properties of the source instead of assuming BT.709.
+    Missing properties are taken from the defaults if given, otherwise guessed from the resolution.
+
+    Returns:
+        A tuple of the tagged video and its resolved properties
+    """
+    if (video.format.color_family != vapoursynth.YUV):
+        return (video, defaults or {})
+
+    props = video.get_frame(0).props
+    high_definition = video.width > 1024 or video.height > 576
+    guesses = {
+        # BT.709 for HD, otherwise BT.601 (with BT.470BG primaries for 576 line PAL video)
+        '_Matrix': 1 if high_definition else 6,
+        '_Transfer': 1 if high_definition else 6,
+        '_Primaries': 1 if high_definition else (5 if video.height == 576 else 6),
+        # Limited range
+        '_ColorRange': 1,
+    }
+    resolved: Dict[str, int] = {}
+    missing: Dict[str, int] = {}
+    for name, guess in guesses.items():
+        value = props.get(name)
+        # 2 is unspecified for the matrix, transfer, and primaries
+        if (value is None or (name != '_ColorRange' and value == 2)):
+            value = defaults[name] if defaults is not None and name in defaults else guess
+            missing[name] = value
+        resolved[name] = int(value) # type: ignore
+
+    return (video.std.SetFrameProps(**missing) if len(missing) > 0 else video, resolved)
+
+# Relative difference allowed between the scores of backends for their results to be considered equivalent
+BACKEND_TOLERANCE = {
+    MetricType.SSIMULACRA2: 0.02,
+    MetricType.Butteraugli: 0.05,
+}
+
+def get_cache_directory() -> str:
+    if (sys.platform == 'win32'):
+        cache_directory = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~/AppData/Local')
+    elif (sys.platform == 'darwin'):
+        cache_directory = os.path.expanduser('~/Library/Caches')
+    else:
+        cache_directory = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_directory, 'media-metrologist')
+
+def benchmark_metric_backend(reference: vapoursynth.VideoNode, distorted: vapoursynth.VideoNode, metric: SSIMULACRA2Metric | ButteraugliMetric, backend: Library, rows: int, columns: int) -> Tuple[float, List[float]]:
+    """
+    Score every frame after the first with a backend on the configured region grid.
+
+    The first frame initializes the plugin (and GPU) outside of the timing.
+
+    Returns:
+        A tuple of the elapsed seconds and the scores of every region of every timed frame
+    """
+    reference_regions = crop_video_regions(reference, rows, columns)
+    distorted_regions = crop_video_regions(distorted, rows, columns)
+    compared_regions = [
+        compare_region_backend(reference_regions[row_index][column_index], distorted_regions[row_index][column_index], metric, backend)
+        for row_index in range(rows)
+        for column_index in range(columns)
+    ]
+
+    for region in compared_regions:
+        region.get_frame(0)
+
+    start_time = time.perf_counter()
+    futures = [region.get_frame_async(frame_index) for frame_index in range(1, reference.num_frames) for region in compared_regions]
+    frames = [future.result() for future in futures]
+    elapsed_time = time.perf_counter() - start_time
+
+    scores = [retrieve_score(frame, metric) for frame in frames]
+    return (elapsed_time, [score.NormInfinite if isinstance(score, ButteraugliValue) else score for score in scores]) # type: ignore
+
+def select_auto_backend(metric_type: MetricType, metric: SSIMULACRA2Metric | ButteraugliMetric, reference: vapoursynth.VideoNode, distorted: vapoursynth.VideoNode, verbose: bool = False) -> Library | None:
+    """
+    Select the fastest installed backend of a metric whose scores agree with the default backend, benchmarked on sample frames.
+    The winner is cached per host, resolution, region grid, thread count, and set of installed backends.
+    """
+    backends = get_metric_backends(metric)
+    if (len(backends) <= 1 or reference.num_frames < 2):
+        return backends[0] if len(backends) > 0 else None
+
+    rows = metric.regions.rows if metric.regions is not None else 1
+    columns = metric.regions.columns if metric.regions is not None else 1
+    cache_path = os.path.join(get_cache_directory(), 'backends.json')
+    cache_key = f'{socket.gethostname()}:{metric_type.value}:{reference.width}x{reference.height}:{rows}x{columns}:{core.num_threads}:{"+".join(backend.value for backend in backends)}'
+
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    if (cache_key in cache and Library(cache[cache_key]['backend']) in backends):
+        return Library(cache[cache_key]['backend'])
+
+    # Decode the sample frames once so no backend is timed with decoding
+    for frame_index in range(reference.num_frames):
+        reference.get_frame(frame_index)
+        distorted.get_frame(frame_index)
+
+    results: Dict[Library, Tuple[float, List[float]]] = {}
+    for backend in backends:
+        try:
+            results[backend] = benchmark_metric_backend(reference, distorted, metric, backend, rows, columns)
+        except Exception as error:
+            print(f'Failed to benchmark {metric_type.value} with {backend.value}: {error}', file=sys.stderr)
+
+    if (len(results) == 0):
+        return None
+
+    # Backends must agree with the backend that would be used without benchmarking
+    default_backend = select_metric_backend(metric_type, metric)
+    baseline_scores = results[default_backend][1] if default_backend in results else None
+    tolerance = BACKEND_TOLERANCE[metric_type]
+    agreeing_backends = [
+        backend for backend, (_elapsed_time, scores) in results.items()
+        if baseline_scores is None or all(abs(score - baseline_score) <= tolerance * max(1.0, abs(baseline_score)) for score, baseline_score in zip(scores, baseline_scores))
+    ]
+    for backend in results:
+        if (backend not in agreeing_backends):
+            print(f'{metric_type.value} scores of {backend.value} differ from {default_backend.value if default_backend else "the default backend"}, skipping it', file=sys.stderr)
+
+    selected_backend = min(agreeing_backends, key=lambda backend: results[backend][0])
+    if (verbose):
+        print(f'{metric_type.value} backends: {", ".join(f"{backend.value} {results[backend][0]:.3f}s" for backend in results)}. Selected {selected_backend.value}')
+
+    cache[cache_key] = {
+        'backend': selected_backend.value,
+        'time': datetime.datetime.now().isoformat(),
+    }
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f, indent=4)
+    except OSError as error:
+        print(f'Failed to cache the selected {metric_type.value} backend: {error}', file=sys.stderr)
+
+    return selected_backend
+
+def compare_region_vmaf(reference: vapoursynth.VideoNode, distorted: vapoursynth.VideoNode, metric: VMAFMetric, features: List[VMAFFeature], log_path: str) -> vapoursynth.VideoNode:
+    """
+    Score a region with libvmaf, writing the per-frame scores and features as JSON to the given log path.
+
+    The log is only written once every frame has been requested in order and the returned node is freed.
+    """
+    return reference.vmaf.VMAF(
+        distorted,
+        model=[VMAF_MODEL_INDEX[metric.model]],
+        log_path=log_path,
+        log_format=1,
+        feature=[VMAF_FEATURE_INDEX[feature] for feature in features],
+    )
+
+def get_vmaf_score_key(metrics: Dict[str, float], model: VMAFModel) -> str | None:
+    """
+    Find the model score among the per-frame metrics of a libvmaf log.
+
+    libvmaf names the score after the model, e.g. vmaf or vmaf_v0.6.1neg, while bootstrapped models add entries
+    such as vmaf_b_v0.6.3_stddev, so the shortest name starting with vmaf is the score if the model name is not found.
+    """
+    for key in (model.value, 'vmaf'):
+        if (key in metrics):
+            return key
+    return min((key for key in metrics if key.startswith('vmaf')), key=len, default=None)
+
+def read_vmaf_log(log_path: str, model: VMAFModel, frame_count: int, timeout: float = 10.0) -> Dict[int, VMAFValue]:
+    """
+    Read the per-frame scores and features from a libvmaf JSON log, keyed by frame number.
+
+    libvmaf writes the log when the filter is freed, so the log is read again until it exists, is valid JSON,
+    and has every frame, up to the timeout. Frames without a model score are left out.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with open(log_path, 'r') as f:
+                log = json.load(f)
+            if (len(log['frames']) >= frame_count):
+                break
+            error: Exception = RuntimeError(f'libvmaf log has {len(log["frames"])} of {frame_count} frames')
+        except (OSError, ValueError, KeyError) as log_error:
+            error = log_error
+        if (time.monotonic() >= deadline):
+            raise RuntimeError(f'libvmaf log {log_path} was not completed') from error
+        time.sleep(0.05)
+
+    values: Dict[int, VMAFValue] = {}
+    for frame in log['frames']:
+        score_key = get_vmaf_score_key(frame['metrics'], model)
+        if (score_key is None):
+            continue
+        values[frame['frameNum']] = VMAFValue(
+            score=frame['metrics'][score_key],
+            features={name: value for name, value in frame['metrics'].items() if name != score_key},
+        )
+    return values
+
+def extract_luma(video: vapoursynth.VideoNode, matrix: int) -> vapoursynth.VideoNode:
+    """
+    Get the luma plane of a video, converting RGB video to luma with the given matrix coefficients (a _Matrix value).
+    """
+    if (video.format.color_family == vapoursynth.GRAY):
+        return video
+    if (video.format.color_family == vapoursynth.RGB):
+        return video.resize.Bicubic(format=video.format.replace(color_family=vapoursynth.GRAY, subsampling_w=0, subsampling_h=0), matrix=matrix)
+    return video.std.ShufflePlanes(planes=0, colorfamily=vapoursynth.GRAY)
+
+# Number of pairs of reference and distorted frame fingerprints whose scores are kept for reuse
+REUSED_SCORES_CAPACITY = 16384
+
+# Bytes of NumPy arrays to hold per batch of SSIM and MS-SSIM frames when the batch size is not configured
+SSIM_BATCH_BYTES = 256 * 1024 * 1024
+
+def get_ssim_batch_size(metric: SSIMMetric, frame_size: int) -> int:
+    """
+    Get the number of frames to score per batch from the estimated bytes held while a single frame is scored.
+
+    Without a configured batch size, batches hold up to 8 frames within SSIM_BATCH_BYTES. Batches are also
+    limited to the memory budget so the memory governor can admit them.
+    """
+    batch_size = metric.batch or max(1, min(8, SSIM_BATCH_BYTES // max(1, frame_size)))
+    if (memory_governor is not None):
+        batch_size = min(batch_size, memory_governor.budget // max(1, frame_size))
+    return max(1, batch_size)
+
+def read_luma_planes(frames: List[vapoursynth.VideoFrame]) -> Tuple[Any, float]:
+    """
+    Read the first plane of each frame into a single float32 array of shape (frames, height, width).
+
+    Each plane is read through the buffer protocol and copied once into the array, converting it to float32.
+
+    Returns:
+        Tuple[numpy.ndarray, float]: The planes and the peak value of the sample type.
+    """
+    sample_format = frames[0].format
+    planes = numpy.empty((len(frames), frames[0].height, frames[0].width), dtype=numpy.float32) # type: ignore
+    for index, frame in enumerate(frames):
+        planes[index] = numpy.asarray(frame[0]) # type: ignore
+
+    data_range = 1.0 if sample_format.sample_type == vapoursynth.FLOAT else float((1 << sample_format.bits_per_sample) - 1)
+    return (planes, data_range)
+
+def gaussian_kernel(size: int, sigma: float = 1.5) -> Any:
+    kernel = numpy.exp(-((numpy.arange(size) - (size - 1) / 2) ** 2) / (2 * sigma ** 2)) # type: ignore
+    return (kernel / kernel.sum()).astype(numpy.float32) # type: ignore
+
+def gaussian_filter(planes: Any, kernel: Any) -> Any:
+    """
+    Filter the last two axes of an array with a separable kernel, keeping only fully covered ("valid") samples.
+    """
+    size = len(kernel)
+    height = planes.shape[-2] - size + 1
+    width = planes.shape[-1] - size + 1
+
+    vertical = kernel[0] * planes[..., 0:height, :]
+    for index in range(1, size):
+        vertical += kernel[index] * planes[..., index:index + height, :]
+
+    filtered = kernel[0] * vertical[..., 0:width]
+    for index in range(1, size):
+        filtered += kernel[index] * vertical[..., index:index + width]
+
+    return filtered
+
+def calculate_ssim(reference: Any, distorted: Any, data_range: float) -> Tuple[Any, Any]:
+    """
+    Calculate the SSIM of each pair of planes in a batch.
+
+    Args:
+        reference (numpy.ndarray): Reference planes of shape (frames, height, width).
+        distorted (numpy.ndarray): Distorted planes of shape (frames, height, width).
+        data_range (float): The peak value of the samples.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: The mean SSIM and mean contrast-structure of each frame.
+    """
+    kernel = gaussian_kernel(min(11, reference.shape[-2], reference.shape[-1]))
+    c1 = (0.01 * data_range) ** 2
+    c2 = (0.03 * data_range) ** 2
+
+    # Filter the means, variances, and covariance of the whole batch in a single pass
+    mu_reference, mu_distorted, reference_squared, distorted_squared, product = gaussian_filter(
+        numpy.stack((reference, distorted, reference * reference, distorted * distorted, reference * distorted)), # type: ignore
+        kernel,
+    )
+
+    mu_reference_squared = mu_reference * mu_reference
+    mu_distorted_squared = mu_distorted * mu_distorted
+    mu_product = mu_reference * mu_distorted
+    sigma_reference = reference_squared - mu_reference_squared
+    sigma_distorted = distorted_squared - mu_distorted_squared
+    sigma_product = product - mu_product
+
+    contrast_structure = (2 * sigma_product + c2) / (sigma_reference + sigma_distorted + c2)
+    luminance = (2 * mu_product + c1) / (mu_reference_squared + mu_distorted_squared + c1)
+
+    return ((luminance * contrast_structure).mean(axis=(-2, -1)), contrast_structure.mean(axis=(-2, -1)))
+
+def calculate_ms_ssim(reference: Any, distorted: Any, data_range: float) -> Any:
+    """
+    Calculate the MS-SSIM of each pair of planes in a batch.
+
+    Uses the weights of Wang et al. over up to 5 scales, as many as the plane dimensions allow.
+
+    Returns:
+        numpy.ndarray: The MS-SSIM of each frame.
+    """
+    weights = [0.0448, 0.2856, 0.3001, 0.2363, 0.1333]
+    smallest_dimension = min(reference.shape[-2], reference.shape[-1])
+    scales = max(1, min(len(weights), int(math.log2(smallest_dimension / 11)) + 1 if smallest_dimension >= 11 else 1))
+    weights = numpy.array(weights[:scales], dtype=numpy.float64) # type: ignore
+    weights = weights / weights.sum()
+
+    values = []
+    for scale in range(scales):
+        ssim, contrast_structure = calculate_ssim(reference, distorted, data_range)
+        values.append(ssim if scale == scales - 1 else contrast_structure)
+
+        if scale < scales - 1:
+            # Downsample by averaging 2x2 blocks
+            height = reference.shape[-2] // 2 * 2
+            width = reference.shape[-1] // 2 * 2
+            reference = (reference[:, 0:height:2, 0:width:2] + reference[:, 1:height:2, 0:width:2] + reference[:, 0:height:2, 1:width:2] + reference[:, 1:height:2, 1:width:2]) / 4
+            distorted = (distorted[:, 0:height:2, 0:width:2] + distorted[:, 1:height:2, 0:width:2] + distorted[:, 0:height:2, 1:width:2] + distorted[:, 1:height:2, 1:width:2]) / 4
+
+    # Negative values are clamped so the weighted product stays real
+    return numpy.prod(numpy.maximum(numpy.stack(values), 0) ** weights[:, None], axis=0) # type: ignore
+
 def get_installed_plugins() -> Dict[Library, bool]:
     installed = {
-        library: hasattr(core, str(library.value)) for library in Library
+        library: core is not None and hasattr(core, str(library.value)) for library in Library
     }
     return installed
 
@@ -845,6 +2089,620 @@ def calculate_metric_scores_average(metric_scores: list[MetricScore]) -> float:
 
     return total / len(metric_scores)
 
+def calculate_metric_score_average(value: list[list[float | ButteraugliValue | VMAFValue | None]], weights: List[List[float]] | None = None) -> float | None:
+    """
+    Average the region scores of a single frame, using NormInfinite for Butteraugli and the model score for VMAF.
+    Regions are weighted by the weights of the regions of interest if given.
+
+    Returns None if none of the regions have been scored.
+    """
+    region_scores = [
+        (column.NormInfinite if isinstance(column, ButteraugliValue) else column.score if isinstance(column, VMAFValue) else column, weights[row_index][column_index] if weights is not None else 1.0)
+        for row_index, row in enumerate(value)
+        for column_index, column in enumerate(row)
+        if column is not None
+    ]
+    if (len(region_scores) == 0):
+        return None
+
+    total_weight = sum(weight for _score, weight in region_scores)
+    if (total_weight <= 0):
+        return sum(score for score, _weight in region_scores) / len(region_scores)
+    return sum(score * weight for score, weight in region_scores) / total_weight
+
+def is_higher_better(metric_type: MetricType) -> bool:
+    # SSIMULACRA and Butteraugli are distances where 0 is identical
+    return metric_type not in (MetricType.SSIMULACRA, MetricType.Butteraugli)
+
+def select_proxy_frames(proxy_scores: List[float | None], proxy: MetricProxy, higher_is_better: bool) -> set[int]:
+    """
+    Select the frames to fully score from their proxy scores.
+
+    Frames without a proxy score are always selected.
+    """
+    if proxy.threshold is None and proxy.worst is None:
+        return set(range(len(proxy_scores)))
+
+    selected = {frame_index for frame_index, score in enumerate(proxy_scores) if score is None}
+    scored = [(frame_index, score) for frame_index, score in enumerate(proxy_scores) if score is not None]
+
+    if proxy.threshold is not None:
+        selected.update(
+            frame_index for frame_index, score in scored
+            if (score < proxy.threshold if higher_is_better else score > proxy.threshold)
+        )
+
+    if proxy.worst is not None and len(scored) > 0:
+        worst_count = math.ceil(len(scored) * min(max(proxy.worst, 0), 100) / 100)
+        worst_first = sorted(scored, key=lambda frame_score: frame_score[1], reverse=not higher_is_better)
+        selected.update(frame_index for frame_index, _score in worst_first[:worst_count])
+
+    return selected
+
+def scale_video(video: vapoursynth.VideoNode, scale: float | None, width: int | None = None, height: int | None = None) -> vapoursynth.VideoNode:
+    """
+    Downscale a video by the given factor, keeping dimensions aligned to chroma subsampling.
+
+    If width and height are given, the video is resized to them instead. Videos already at the target dimensions are returned as is.
+    """
+    if width is None or height is None:
+        if scale is None or scale >= 1:
+            return video
+        width_alignment = 1 << video.format.subsampling_w
+        height_alignment = 1 << video.format.subsampling_h
+        width = max(width_alignment, int(video.width * scale) // width_alignment * width_alignment)
+        height = max(height_alignment, int(video.height * scale) // height_alignment * height_alignment)
+
+    if video.width == width and video.height == height:
+        return video
+    return video.resize.Bicubic(width=width, height=height)
+
+class SecondPool:
+    """
+    Per-second aggregates of the frame scores of a distorted video and metric across every scene
+
+    Each scene pools the seconds it covers. A second spanning a scene cut is merged from the partial seconds of each
+    scene and completed once every one of its frames has been pooled, so every second is reported once with its absolute index.
+    Completed seconds are stored in the pooling of the first scene covering them.
+    """
+    def __init__(self, fps: Fraction, scenes: List[Tuple[int, int, int, TemporalPooling]]):
+        # (scene index, first reference frame, end reference frame, pooling) of every scene
+        self.fps = fps
+        self.scenes = scenes
+        self.partial: Dict[int, Tuple[PooledSecond | None, int]] = {}
+
+    def count_frames(self, second: int) -> Tuple[int, int]:
+        """
+        Count the frames of a second covered by the scenes and find the index of the first scene covering it.
+        """
+        first_frame = -(-second * self.fps.numerator // self.fps.denominator)
+        end_frame = -(-(second + 1) * self.fps.numerator // self.fps.denominator)
+        frames = 0
+        owner: Tuple[int, int] | None = None
+        for scene_index, start, end, _pooling in self.scenes:
+            covered = min(end, end_frame) - max(start, first_frame)
+            if (covered > 0):
+                frames = frames + covered
+                if (owner is None or max(start, first_frame) < owner[1]):
+                    owner = (scene_index, max(start, first_frame))
+        return (frames, owner[0] if owner is not None else 0)
+
+    def push(self, second: int, pooled: PooledSecond | None, positions: int) -> Tuple[int, PooledSecond] | None:
+        """
+        Add the partial aggregate of a second pooled over a number of frames of a scene, where pooled is None if none of them were scored.
+
+        Returns the index of the scene the second is stored in and the second once every frame of it has been pooled.
+        """
+        merged, merged_positions = self.partial.pop(second, (None, 0))
+        if (merged is None):
+            merged = pooled
+        elif (pooled is not None):
+            frames = merged.frames + pooled.frames
+            merged = PooledSecond(
+                second=second,
+                frames=frames,
+                average=(merged.average * merged.frames + pooled.average * pooled.frames) / frames,
+                minimum=min(merged.minimum, pooled.minimum),
+                maximum=max(merged.maximum, pooled.maximum),
+            )
+        merged_positions = merged_positions + positions
+
+        expected_positions, owner_index = self.count_frames(second)
+        if (merged_positions < expected_positions):
+            self.partial[second] = (merged, merged_positions)
+            return None
+        if (merged is None):
+            return None
+
+        owner_pooling = next(pooling for scene_index, _start, _end, pooling in self.scenes if scene_index == owner_index)
+        owner_pooling.seconds.append(merged)
+        return (owner_index, merged)
+
+class TemporalPool:
+    """
+    Streaming temporal pooling of frame scores for a single scene, distorted video, and metric
+
+    Frame scores may arrive in any order and are held until every earlier frame of the scene has arrived.
+    Each frame then updates the sliding window minimum, maximum, and average and the per-second aggregates in amortized O(1).
+    Frames without a score (None) advance the window without contributing to it.
+    Seconds are indexed from the start of the reference video and merged across scenes by a SecondPool.
+    """
+    def __init__(self, pooling: TemporalPooling, length: int, start: int, seconds: SecondPool | None, frames: bool = True):
+        self.pooling = pooling
+        self.length = length
+        self.start = start
+        self.seconds = seconds
+        self.frames = frames
+        self.next_frame = 0
+        self.pending: Dict[int, float | None] = {}
+        self.window_values: deque[Tuple[int, float]] = deque()
+        self.window_sum = 0.0
+        # Monotonic queues where the front is the minimum/maximum of the window
+        self.window_minimum: deque[Tuple[int, float]] = deque()
+        self.window_maximum: deque[Tuple[int, float]] = deque()
+        # Second being pooled, its aggregate of the scored frames so far, and the number of frames pooled in it
+        self.second_index: int | None = None
+        self.second: PooledSecond | None = None
+        self.second_positions = 0
+
+    def push(self, frame_index: int, value: float | None) -> List[Tuple[PooledFrame | None, Tuple[int, PooledSecond] | None]]:
+        """
+        Add the score of a frame and return the pooled values of every frame that could be advanced,
+        along with every second completed with the index of the scene it is stored in.
+        Frames that were already pushed are ignored.
+        """
+        if frame_index < self.next_frame or frame_index >= self.length or frame_index in self.pending:
+            return []
+
+        self.pending[frame_index] = value
+        updates: List[Tuple[PooledFrame | None, Tuple[int, PooledSecond] | None]] = []
+        while self.next_frame in self.pending:
+            updates.append(self.advance(self.next_frame, self.pending.pop(self.next_frame)))
+            self.next_frame = self.next_frame + 1
+
+        # Flush the last second once the scene is complete
+        if self.next_frame == self.length:
+            completed_second = self.complete_second()
+            if completed_second is not None:
+                updates.append((None, completed_second))
+
+        return updates
+
+    def complete_second(self) -> Tuple[int, PooledSecond] | None:
+        if self.seconds is None or self.second_index is None:
+            return None
+
+        completed_second = self.seconds.push(self.second_index, self.second, self.second_positions)
+        self.second_index = None
+        self.second = None
+        self.second_positions = 0
+        return completed_second
+
+    def advance(self, frame_index: int, value: float | None) -> Tuple[PooledFrame | None, Tuple[int, PooledSecond] | None]:
+        window = self.pooling.window
+
+        # Expire frames that left the window
+        while len(self.window_values) > 0 and self.window_values[0][0] <= frame_index - window:
+            _expired_index, expired_value = self.window_values.popleft()
+            self.window_sum = self.window_sum - expired_value
+        while len(self.window_minimum) > 0 and self.window_minimum[0][0] <= frame_index - window:
+            self.window_minimum.popleft()
+        while len(self.window_maximum) > 0 and self.window_maximum[0][0] <= frame_index - window:
+            self.window_maximum.popleft()
+
+        if value is not None:
+            self.window_values.append((frame_index, value))
+            self.window_sum = self.window_sum + value
+            while len(self.window_minimum) > 0 and self.window_minimum[-1][1] >= value:
+                self.window_minimum.pop()
+            self.window_minimum.append((frame_index, value))
+            while len(self.window_maximum) > 0 and self.window_maximum[-1][1] <= value:
+                self.window_maximum.pop()
+            self.window_maximum.append((frame_index, value))
+
+        pooled_frame = None
+        if self.frames and len(self.window_values) > 0:
+            pooled_frame = PooledFrame(
+                frame=frame_index,
+                minimum=self.window_minimum[0][1],
+                maximum=self.window_maximum[0][1],
+                average=self.window_sum / len(self.window_values),
+            )
+            self.pooling.frames.append(pooled_frame)
+
+        completed_second = None
+        if self.seconds is not None:
+            second_index = (self.start + frame_index) * self.seconds.fps.denominator // self.seconds.fps.numerator
+            if self.second_index is not None and self.second_index != second_index:
+                completed_second = self.complete_second()
+
+            self.second_index = second_index
+            self.second_positions = self.second_positions + 1
+            if value is not None:
+                if self.second is None:
+                    self.second = PooledSecond(second=second_index, frames=1, average=value, minimum=value, maximum=value)
+                else:
+                    self.second.frames = self.second.frames + 1
+                    self.second.average = self.second.average + (value - self.second.average) / self.second.frames
+                    self.second.minimum = min(self.second.minimum, value)
+                    self.second.maximum = max(self.second.maximum, value)
+
+        return (pooled_frame, completed_second)
+
+def fingerprint_video(video: vapoursynth.VideoNode, mode: DeduplicationMode, matrix: int) -> vapoursynth.VideoNode:
+    if (mode == DeduplicationMode.LUMA):
+        return extract_luma(video, matrix).resize.Bilinear(width=64, height=64, format=vapoursynth.GRAY8)
+    return video
+
+def fingerprint_frame(frame: vapoursynth.VideoFrame) -> bytes:
+    """
+    Hash every plane of a frame along with its dimensions and format.
+    """
+    digest = hashlib.blake2b(f'{frame.width}x{frame.height}:{frame.format.id}'.encode(), digest_size=16)
+    for plane in range(frame.format.num_planes):
+        # Planes are padded to their stride, so hash only the visible samples
+        digest.update(memoryview(frame[plane]).tobytes()) # type: ignore
+    return digest.digest()
+
+def get_resident_memory() -> int | None:
+    """
+    Get the resident set size (RSS) of this process in bytes, or None if it cannot be measured.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def estimate_frame_size(video: vapoursynth.VideoNode) -> int:
+    """
+    Estimate the number of bytes of a single frame of a video.
+    """
+    video_format = video.format
+    return sum(
+        (video.width >> (video_format.subsampling_w if plane > 0 else 0)) * (video.height >> (video_format.subsampling_h if plane > 0 else 0)) * video_format.bytes_per_sample
+        for plane in range(video_format.num_planes)
+    )
+
+def estimate_metric_frame_size(reference: vapoursynth.VideoNode, distorted: vapoursynth.VideoNode, metric: Metric) -> int:
+    """
+    Estimate the number of bytes held in memory while a single frame of a metric is scored,
+    including the reference and distorted frames and any intermediate copies of both.
+    """
+    metric_format = get_metric_format(metric, reference.format, distorted.format)
+    if (isinstance(metric, SSIMMetric)):
+        # float32 planes, their products, and filtered statistics in NumPy
+        intermediate_bytes_per_pixel = 64
+    elif (metric_format is not None and metric_format != reference.format.id):
+        # Converted copies of both inputs
+        intermediate_bytes_per_pixel = 2 * core.get_video_format(metric_format).num_planes * core.get_video_format(metric_format).bytes_per_sample
+    else:
+        intermediate_bytes_per_pixel = 0
+
+    return estimate_frame_size(reference) + estimate_frame_size(distorted) + reference.width * reference.height * intermediate_bytes_per_pixel
+
+class MemoryGovernor:
+    """
+    Limit the estimated bytes of frames in flight across all pipelines to fit a memory budget
+
+    The allowance starts at the budget left after the VapourSynth frame cache and adapts to the measured RSS:
+    it is halved when RSS exceeds 90% of the budget and grows by 5% of the budget while RSS is below 70%.
+    A single job is always allowed so every pipeline makes progress.
+    """
+    def __init__(self, budget: int, allowance: int):
+        self.budget = budget
+        self.allowance = max(1, allowance)
+        self.in_flight = 0
+        self.last_measurement = 0.0
+        self.condition = Condition()
+
+    async def acquire(self, size: int):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight == 0 or self.in_flight + size <= self.allowance)
+            self.in_flight = self.in_flight + size
+
+    async def release(self, size: int):
+        async with self.condition:
+            self.in_flight = self.in_flight - size
+            self.adapt()
+            self.condition.notify_all()
+
+    def adapt(self):
+        # Limit measurements to 4 per second
+        now = time.monotonic()
+        if now - self.last_measurement < 0.25:
+            return
+        self.last_measurement = now
+
+        resident_memory = get_resident_memory()
+        if resident_memory is None:
+            return
+        if resident_memory > self.budget * 0.9:
+            self.allowance = max(1, self.allowance // 2)
+        elif resident_memory < self.budget * 0.7:
+            self.allowance = min(self.budget, self.allowance + self.budget // 20)
+
+EXPORT_KEY_COLUMNS = ('scene', 'distortedId', 'frame', 'referenceFrame', 'row', 'column')
+
+def get_export_format(path: str, export_format: ExportFormat | None = None) -> ExportFormat:
+    if (export_format is not None):
+        return export_format
+    _path_base, path_ext = os.path.splitext(path)
+    if (path_ext.lower() == '.parquet'):
+        return ExportFormat.PARQUET
+    if (path_ext.lower() == '.npy'):
+        return ExportFormat.NPY
+    return ExportFormat.ARROW
+
+def get_export_value_columns(metric_type: MetricType, value: float | ButteraugliValue | VMAFValue) -> List[Tuple[str, float]]:
+    """
+    Flatten a region score into (column, value) pairs with one column per metric, norm, or VMAF feature.
+    """
+    if (isinstance(value, ButteraugliValue)):
+        return [(f'{metric_type.value}.{norm}', getattr(value, norm)) for norm in ('Norm2', 'Norm3', 'NormInfinite')]
+    if (isinstance(value, VMAFValue)):
+        return [(metric_type.value, value.score)] + [(f'{metric_type.value}.{feature}', feature_value) for feature, feature_value in value.features.items()]
+    return [(metric_type.value, value)]
+
+def build_export_columns(config: Configuration) -> Dict[str, List[Any]]:
+    """
+    Build the columns of the export with one row per region of every scored frame, sorted by scene, distorted id, frame, row, and column.
+    Regions a metric did not score, including regions of metrics with a different grid, are NaN.
+    """
+    row_indices: Dict[Tuple[int, str, int, int, int, int], int] = {}
+    keys: List[Tuple[int, str, int, int, int, int]] = []
+    values: Dict[str, Dict[int, float]] = {}
+
+    for scene_index, scene in enumerate(config.scenes):
+        for distorted_id, distorted in scene.distorted.items():
+            for metric_type, metric_scores in distorted.scores.items():
+                for scene_frame_index, metric_score in enumerate(metric_scores):
+                    for row_index, row in enumerate(metric_score.value):
+                        for column_index, value in enumerate(row):
+                            if (value is None):
+                                continue
+                            key = (scene_index, distorted_id, distorted.start + scene_frame_index, scene.reference.start + scene_frame_index, row_index, column_index)
+                            if (key not in row_indices):
+                                row_indices[key] = len(keys)
+                                keys.append(key)
+                            for column, column_value in get_export_value_columns(metric_type, value):
+                                values.setdefault(column, {})[row_indices[key]] = column_value
+
+    # Sorting keeps each scene and distorted video contiguous, so readers can skip row groups and batches
+    order = sorted(range(len(keys)), key=lambda index: keys[index])
+    columns: Dict[str, List[Any]] = {
+        name: [keys[index][position] for index in order]
+        for position, name in enumerate(EXPORT_KEY_COLUMNS)
+    }
+    for column in sorted(values):
+        column_values = values[column]
+        columns[column] = [column_values.get(index, math.nan) for index in order]
+
+    return columns
+
+def export_results(config: Configuration, export: ExportOutput):
+    columns = build_export_columns(config)
+    path = export.path
+    export_format = get_export_format(path, export.format)
+
+    if (export_format in (ExportFormat.ARROW, ExportFormat.PARQUET) and pyarrow is None):
+        path = os.path.splitext(path)[0] + '.npy'
+        export_format = ExportFormat.NPY
+        print(f'PyArrow is not installed, exporting results as a NumPy array instead: {path}')
+
+    if (export_format == ExportFormat.NPY):
+        if (numpy is None):
+            print('NumPy is not installed, results could not be exported')
+            return
+        distorted_id_length = max([len(distorted_id) for distorted_id in columns['distortedId']], default=1)
+        dtype = [
+            ('scene', numpy.int32),
+            ('distortedId', f'U{distorted_id_length}'),
+            ('frame', numpy.int32),
+            ('referenceFrame', numpy.int32),
+            ('row', numpy.int32),
+            ('column', numpy.int32),
+        ] + [(column, numpy.float64) for column in columns if column not in EXPORT_KEY_COLUMNS]
+        array = numpy.empty(len(columns['scene']), dtype=dtype)
+        for column, column_values in columns.items():
+            array[column] = column_values
+        numpy.save(path, array)
+        return
+
+    schema = pyarrow.schema(
+        [
+            ('scene', pyarrow.int32()),
+            ('distortedId', pyarrow.string()),
+            ('frame', pyarrow.int32()),
+            ('referenceFrame', pyarrow.int32()),
+            ('row', pyarrow.int32()),
+            ('column', pyarrow.int32()),
+        ] + [(column, pyarrow.float64()) for column in columns if column not in EXPORT_KEY_COLUMNS]
+    )
+    table = pyarrow.Table.from_pydict(columns, schema=schema)
+
+    if (export_format == ExportFormat.PARQUET):
+        pyarrow.parquet.write_table(table, path)
+    else:
+        # Uncompressed so the file can be memory-mapped without copying
+        with pyarrow.ipc.new_file(path, schema) as writer:
+            writer.write_table(table)
+
+class ResultsReader:
+    """
+    Read exported results without loading the whole file
+
+    Arrow IPC files are memory-mapped, Parquet files only read the row groups matching the filters,
+    and NumPy files are memory-mapped with only the selected rows copied.
+
+    Usage
+    ---
+        reader = ResultsReader('results.arrow')
+        columns = reader.read(scene=0, distorted_id='x264', frames=(0, 240), columns=['SSIMULACRA2'])
+    """
+    def __init__(self, path: str, export_format: ExportFormat | None = None):
+        self.path = path
+        self.format = get_export_format(path, export_format)
+
+    def read(self, scene: int | None = None, distorted_id: str | None = None, frames: Tuple[int, int] | None = None, columns: List[str] | None = None) -> Dict[str, Any]:
+        """
+        Read the rows of a scene, distorted video, and range of distorted frames (start inclusive, end exclusive)
+        as a dictionary of NumPy arrays. The key columns are always included.
+        """
+        selected_columns = None if columns is None else list(EXPORT_KEY_COLUMNS) + [column for column in columns if column not in EXPORT_KEY_COLUMNS]
+
+        if (self.format == ExportFormat.NPY):
+            array = numpy.load(self.path, mmap_mode='r')
+            mask = numpy.ones(len(array), dtype=bool)
+            if (scene is not None):
+                mask &= array['scene'] == scene
+            if (distorted_id is not None):
+                mask &= array['distortedId'] == distorted_id
+            if (frames is not None):
+                mask &= (array['frame'] >= frames[0]) & (array['frame'] < frames[1])
+            rows = numpy.flatnonzero(mask)
+            return {column: numpy.asarray(array[column][rows]) for column in (selected_columns or array.dtype.names)}
+
+        if (self.format == ExportFormat.PARQUET):
+            filters = []
+            if (scene is not None):
+                filters.append(('scene', '=', scene))
+            if (distorted_id is not None):
+                filters.append(('distortedId', '=', distorted_id))
+            if (frames is not None):
+                filters.append(('frame', '>=', frames[0]))
+                filters.append(('frame', '<', frames[1]))
+            table = pyarrow.parquet.read_table(self.path, columns=selected_columns, filters=filters or None, memory_map=True)
+        else:
+            # The table references the mapped pages, so the map stays open for as long as the table is alive
+            table = pyarrow.ipc.open_file(pyarrow.memory_map(self.path, 'r')).read_all()
+            if (selected_columns is not None):
+                table = table.select(selected_columns)
+            mask = None
+            for condition in [
+                pyarrow.compute.equal(table['scene'], scene) if scene is not None else None,
+                pyarrow.compute.equal(table['distortedId'], distorted_id) if distorted_id is not None else None,
+                pyarrow.compute.greater_equal(table['frame'], frames[0]) if frames is not None else None,
+                pyarrow.compute.less(table['frame'], frames[1]) if frames is not None else None,
+            ]:
+                if (condition is not None):
+                    mask = condition if mask is None else pyarrow.compute.and_(mask, condition)
+            if (mask is not None):
+                table = table.filter(mask)
+
+        return {column: table[column].to_numpy() for column in table.column_names}
+
+class ResultsDatabase:
+    """
+    SQLite store of frame scores across runs, for queries that compare encoder builds without reloading every results JSON
+
+    Each row is the score of a frame (the weighted average of its regions, NormInfinite for Butteraugli) keyed by the title (full path of the
+    reference video), encoder label, distorted id, metric, scene, and reference frame number, so running a configuration again replaces its
+    previous rows. Region scores are not stored, only the frame averages.
+    """
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.pending: List[Tuple[Any, ...]] = []
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS scores (
+                title TEXT NOT NULL,
+                encoder TEXT NOT NULL,
+                distorted_id TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                scene INTEGER NOT NULL,
+                frame INTEGER NOT NULL,
+                reference_frame INTEGER NOT NULL,
+                value REAL,
+                proxy REAL,
+                skipped INTEGER NOT NULL DEFAULT 0,
+                reused INTEGER NOT NULL DEFAULT 0,
+                time TEXT NOT NULL,
+                PRIMARY KEY (title, encoder, metric, scene, reference_frame, distorted_id)
+            );
+            CREATE INDEX IF NOT EXISTS scores_encoder ON scores (encoder, distorted_id, metric, scene);
+            CREATE INDEX IF NOT EXISTS scores_title ON scores (metric, title, encoder, value);
+        """)
+
+    def add_frame_score(self, config: Configuration, scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_index: int):
+        """
+        Queue the score of a frame to be written on the next commit.
+        """
+        scene = config.scenes[scene_index]
+        distorted = scene.distorted[distorted_id]
+        metric_score = distorted.scores[metric_type][scene_frame_index]
+        self.pending.append((
+            os.path.normpath(os.path.abspath(config.reference.path)),
+            config.distorted[distorted_id].encoder or distorted_id,
+            distorted_id,
+            metric_type.value,
+            scene_index,
+            distorted.start + scene_frame_index,
+            scene.reference.start + scene_frame_index,
+            None if metric_score.skipped else calculate_metric_score_average(metric_score.value, get_region_weights(scene, config.metrics[metric_type])),
+            metric_score.proxy,
+            1 if metric_score.skipped else 0,
+            1 if metric_score.reused else 0,
+            metric_score.time.isoformat(),
+        ))
+
+    def commit(self):
+        if (len(self.pending) == 0):
+            return
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', self.pending)
+        self.pending = []
+
+    def close(self):
+        self.commit()
+        self.connection.close()
+
+    def percentiles(self, metric_type: MetricType, percentile: float, encoders: List[str] | None = None) -> List[Tuple[str, str, float]]:
+        """
+        Get the nearest-rank percentile (0-100) of the frame scores of a metric per title and encoder as (title, encoder, score) rows.
+        Frames skipped by a metric proxy are excluded.
+        """
+        encoder_filter = f'AND encoder IN ({", ".join("?" for _ in encoders)})' if encoders else ''
+        return self.connection.execute(f"""
+            WITH ranked AS (
+                SELECT title, encoder, value,
+                    ROW_NUMBER() OVER (PARTITION BY title, encoder ORDER BY value) AS position,
+                    COUNT(*) OVER (PARTITION BY title, encoder) AS total
+                FROM scores
+                WHERE metric = ? AND value IS NOT NULL {encoder_filter}
+            )
+            SELECT title, encoder, MIN(value)
+            FROM ranked
+            WHERE position >= (? / 100.0) * total
+            GROUP BY title, encoder
+            ORDER BY title, encoder
+        """, [metric_type.value, *(encoders or []), percentile]).fetchall()
+
+    def regressions(self, metric_type: MetricType, baseline: str, candidate: str, threshold: float) -> List[Tuple[str, int, float, float, float]]:
+        """
+        Get the frames of every title where the candidate encoder scored worse than the baseline encoder by more than the threshold,
+        as (title, reference frame, baseline score, candidate score, regression) rows ordered by the largest regression.
+
+        Encoders are the labels of the distorted video inputs, which default to their ids, so two builds scored as two distorted inputs
+        of one configuration are compared by their ids. Each encoder should label a single distorted input of a title.
+        """
+        # Regression is positive when the candidate is worse, whichever direction the metric is better in
+        regression = 'baseline.value - candidate.value' if is_higher_better(metric_type) else 'candidate.value - baseline.value'
+        return self.connection.execute(f"""
+            SELECT baseline.title, baseline.reference_frame, baseline.value, candidate.value, {regression} AS regression
+            FROM scores AS baseline
+            JOIN scores AS candidate
+                ON candidate.title = baseline.title
+                AND candidate.encoder = ?
+                AND candidate.metric = baseline.metric
+                AND candidate.reference_frame = baseline.reference_frame
+            WHERE baseline.metric = ? AND baseline.encoder = ?
+                AND baseline.value IS NOT NULL AND candidate.value IS NOT NULL
+                AND {regression} > ?
+            ORDER BY regression DESC
+        """, [candidate, metric_type.value, baseline, threshold]).fetchall()
+
 # endregion Utility Functions
 
 # region Main
@@ -852,49 +2710,112 @@ def calculate_metric_scores_average(metric_scores: list[MetricScore]) -> float:
 # Check which dependencies are installed
 installed = get_installed_plugins()
 
-# Parse arguments
-parser = argparse.ArgumentParser(prog='Multimedia Metrologist', description='Measure video quality between videos.')
-parser.add_argument('config', help='Configuration JSON path. Can be relative to this script or a full path. Results will also be saved to this path.')
-args = parser.parse_args()
-config_path = str(args.config)
+# Frames in flight are limited by the memory budget once the event loop is running
+memory_governor: MemoryGovernor | None = None
+
+# Fingerprints of reference and distorted frames, keyed by input and frame number
+frame_fingerprints: Dict[Tuple[Any, ...], Task[bytes]] = {}
+
+# Keys of the fingerprints requested by each scene and the number of its metrics still being scored, so the
+# fingerprints of a scene are evicted once every metric of the scene has finished
+scene_fingerprint_keys: Dict[int, set[Tuple[Any, ...]]] = {}
+scene_pending_metrics: Dict[int, int] = {}
 
-# Resolve the config JSON path
-if (not os.path.isabs(config_path)):
-    config_path = os.path.join(os.getcwd(), config_path)
+# Region scores of each metric keyed by the fingerprints of the scored reference and distorted frames, keeping the most
+# recently scored or reused REUSED_SCORES_CAPACITY pairs so identical frames are reused across scenes in bounded memory
+reused_scores: Dict[Tuple[MetricType, Tuple[Tuple[RegionOfInterest, ...], ...] | None, Tuple[int, int], bytes, bytes], Future[List[Tuple[float | ButteraugliValue | VMAFValue | None, int, int]]]] = {}
 
-# Load the configuration
-config = deserialize_config(config_path)
+# Streaming temporal pools for each scene, distorted video, and metric
+temporal_pools: Dict[Tuple[int, str, MetricType], TemporalPool] = {}
 
-# Get report on installed plugins and print to console
-if (config.output.verbose):
-    print('Installed Plugins:')
-    for library, is_installed in installed.items():
-        print(f'  - {library.name}: {("Yes" if is_installed else "No")}')
-    print()
+# Per-second aggregates of each distorted video and metric merged across scenes, or None for variable framerate references
+second_pools: Dict[Tuple[str, MetricType], SecondPool | None] = {}
 
-# Set threads if defined
-if (config.threads and config.threads > 0):
-    core.num_threads = config.threads
+# Cross-run store of frame scores, opened once the event loop is running
+results_database: ResultsDatabase | None = None
 
-# Import each video file with the respective selected importer if available
-print(f'Importing reference video: {config.reference.path}')
-reference_video = import_video(config.reference.path, config.reference.importMethods)
-distorted_map: Dict[str, vapoursynth.VideoNode] = {}
+# Streamed YUV4MPEG2 inputs keyed by path
+y4m_streams: Dict[str, Y4MStream] = {}
 
-# Scale reference video if defined
-if (config.reference.scale is not None):
-    reference_video = reference_video.resize.Bicubic(width=config.reference.scale.width, height=config.reference.scale.height)
+# Backends of metrics and proxies with the auto implementation keyed by metric instance, selected by benchmarking them
+# at startup at the size they are scored at
+selected_backends: Dict[Metric, Library] = {}
 
-for key, value in config.distorted.items():
-    print(f'Importing distorted video: {value.path}')
-    distorted_map[key] = import_video(value.path, value.importMethods)
+# Metric computed by the proxy of each metric, an instance of its own so it selects its own backend
+proxy_metrics: Dict[MetricType, Metric] = {}
 
-    # Scale distorted video if defined otherwise scale to match the dimensions of the reference video
-    distorted_map[key] = distorted_map[key].resize.Bicubic(width=value.scale.width if value.scale is not None else reference_video.width, height=value.scale.height if value.scale is not None else reference_video.height)
+# Distorted videos converted to the format of a metric, shared by every scene and metric scored in that format
+converted_videos: Dict[Tuple[str, int], vapoursynth.VideoNode] = {}
 
-# Start timer for metrics comparison
-comparison_start_time = time.time()
-total_unscored_frames = reduce(lambda total, scene: total + count_scene_unscored_frames(scene), config.scenes, 0)
+# Distorted videos as imported, before they were resized to the size they are scored at
+unscaled_videos: Dict[str, vapoursynth.VideoNode] = {}
+
+# Reference video resized to the scoring size of each ladder rung and converted to the format of each metric, keyed by
+# width, height, and format (None if only resized), built once and shared by every rung and metric
+reference_pyramid: Dict[Tuple[int, int, int | None], vapoursynth.VideoNode] = {}
+
+# Picture area of each scene without letterbox and pillarbox bars, detected once and shared by every metric
+letterbox_areas: Dict[int, Task[RegionOfInterest]] = {}
+
+# Rectangles of the regions of interest of each scene and region configuration, or None for a plain grid
+region_rectangles: Dict[Tuple[int, Tuple[Any, ...] | None], List[List[RegionOfInterest]] | None] = {}
+
+def get_luma_matrix() -> int:
+    """
+    Get the matrix coefficients to convert RGB video to luma with, those of the reference video or else guessed from its resolution.
+    """
+    return reference_color_properties.get('_Matrix', 1 if reference_video.width > 1024 or reference_video.height > 576 else 6)
+
+async def detect_scene_letterbox(scene_index: int) -> RegionOfInterest:
+    """
+    Detect the letterbox bars of the reference video of a scene once, sampling frames at a quarter, half, and three quarters of the scene.
+    The picture area is stored with the scene so later runs and the weights of its regions of interest use the same area.
+    """
+    scene = config.scenes[scene_index]
+    if (scene.letterbox is not None):
+        return scene.letterbox
+
+    if (scene_index not in letterbox_areas):
+        scene_length = scene.reference.end - scene.reference.start
+        frame_indices = sorted({scene.reference.start + scene_length * quarter // 4 for quarter in (1, 2, 3)})
+        letterbox_areas[scene_index] = create_task(to_thread(detect_letterbox, reference_video, frame_indices, get_luma_matrix()))
+    area = await letterbox_areas[scene_index]
+
+    if (scene.letterbox is None):
+        scene.letterbox = area
+        if (config.output.console):
+            print(f'LETTERBOX: {serialize_letterbox_report(LetterboxReport(scene=scene_index, letterbox=area))}', flush=True)
+    return area
+
+async def plan_region_rectangles(scene_index: int, metric: Metric) -> List[List[RegionOfInterest]] | None:
+    """
+    Plan the rectangles of the regions of a metric in a scene, aligned to the chroma subsampling of the reference video.
+
+    Returns None when the metric uses a plain grid over the whole frame.
+    """
+    key = (scene_index, get_regions_key(metric.regions))
+    if (key in region_rectangles):
+        return region_rectangles[key]
+
+    rois = get_region_rois(config.scenes[scene_index], metric)
+    letterbox = metric.regions is not None and bool(metric.regions.letterbox)
+    if (rois is None and not letterbox):
+        region_rectangles[key] = None
+        return None
+
+    area = RegionOfInterest(0, 0, reference_video.width, reference_video.height)
+    if (letterbox):
+        area = await detect_scene_letterbox(scene_index)
+
+    subsampling_w = reference_video.format.subsampling_w
+    subsampling_h = reference_video.format.subsampling_h
+    if (rois is not None):
+        rectangles = [[align_region(intersect_region(roi, area), reference_video.width, reference_video.height, subsampling_w, subsampling_h) for roi in rois]]
+    else:
+        rectangles = divide_region(area, metric.regions.rows, metric.regions.columns, subsampling_w, subsampling_h) # type: ignore
+
+    region_rectangles[key] = rectangles
+    return rectangles
 
 async def process_region(compared_regions: List[List[vapoursynth.VideoNode]], scene_frame_index: int, row_index: int, column_index: int, metric_type: MetricType) -> Tuple[float | ButteraugliValue, int, int]:
     def retrieve_region(region: vapoursynth.VideoNode) -> vapoursynth.VideoFrame:
@@ -904,30 +2825,74 @@ async def process_region(compared_regions: List[List[vapoursynth.VideoNode]], sc
     score = retrieve_score(region, config.metrics[metric_type])
     return (score, row_index, column_index)
 
-async def process_frame(compared_regions: List[List[vapoursynth.VideoNode]], scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_index: int):
+def initialize_metric_scores(scene_index: int, distorted_id: str, metric_type: MetricType) -> List[MetricScore]:
     scene = config.scenes[scene_index]
     metric = config.metrics[metric_type]
-    rows = metric.regions.rows if metric.regions is not None else 1
-    columns = metric.regions.columns if metric.regions is not None else 1
-
-    start_time = datetime.datetime.now()
-    results = await gather(*[process_region(compared_regions, scene_frame_index, row_index, column_index, metric_type) for row_index in range(rows) for column_index in range(columns)])
-    end_time = datetime.datetime.now()
+    rectangles = region_rectangles.get((scene_index, get_regions_key(metric.regions)))
+    rows = len(rectangles) if rectangles is not None else metric.regions.rows if metric.regions is not None else 1
+    columns = len(rectangles[0]) if rectangles is not None else metric.regions.columns if metric.regions is not None else 1
 
-    if (len(config.scenes[scene_index].distorted[distorted_id].scores[metric_type]) == 0):
+    if (len(scene.distorted[distorted_id].scores[metric_type]) == 0):
         # Initialize the score array with empty/placeholder values
-        config.scenes[scene_index].distorted[distorted_id].scores[metric_type] = [
+        scene.distorted[distorted_id].scores[metric_type] = [
             MetricScore(
-                time=end_time,
+                time=datetime.datetime.now(),
                 value=[[None for _ in range(columns)] for _ in range(rows)]
             ) for _ in range(scene.reference.end - scene.reference.start)
         ]
 
-    config.scenes[scene_index].distorted[distorted_id].scores[metric_type][scene_frame_index].time = end_time
-    for score, row_index, column_index in results:
-        config.scenes[scene_index].distorted[distorted_id].scores[metric_type][scene_frame_index].value[row_index][column_index] = score
+    return scene.distorted[distorted_id].scores[metric_type]
 
-    # Update MetricScore with final values
+def create_temporal_pool(scene_index: int, distorted_id: str, metric_type: MetricType) -> TemporalPool | None:
+    if (config.pooling is None):
+        return None
+
+    scene = config.scenes[scene_index]
+    distorted_scene = scene.distorted[distorted_id]
+    fps = reference_video.fps if reference_video.fps.numerator > 0 else None
+    # Default to one second of frames, or 24 frames for variable framerate references
+    window = config.pooling.window or (max(1, round(fps)) if fps is not None else 24)
+
+    if ((distorted_id, metric_type) not in second_pools):
+        # Pooling is recomputed from every frame score on each run, resetting every scene at once so seconds
+        # spanning a scene cut can be stored in a scene pooled earlier or later
+        pooled_scenes: List[Tuple[int, int, int, TemporalPooling]] = []
+        for pooled_scene_index, pooled_scene in enumerate(config.scenes):
+            if (distorted_id in pooled_scene.distorted and metric_type in pooled_scene.distorted[distorted_id].scores):
+                pooled_distorted = pooled_scene.distorted[distorted_id]
+                pooled_distorted.pooling[metric_type] = TemporalPooling(window=window, frames=[], seconds=[])
+                pooled_scenes.append((pooled_scene_index, pooled_scene.reference.start, pooled_scene.reference.start + pooled_distorted.end - pooled_distorted.start, pooled_distorted.pooling[metric_type]))
+        second_pools[(distorted_id, metric_type)] = SecondPool(fps, pooled_scenes) if fps is not None else None
+
+    temporal_pools[(scene_index, distorted_id, metric_type)] = TemporalPool(
+        distorted_scene.pooling[metric_type],
+        distorted_scene.end - distorted_scene.start,
+        scene.reference.start,
+        second_pools[(distorted_id, metric_type)],
+        config.pooling.frames is not False,
+    )
+    return temporal_pools[(scene_index, distorted_id, metric_type)]
+
+def pool_frame_score(scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_index: int):
+    if ((scene_index, distorted_id, metric_type) not in temporal_pools):
+        return
+
+    metric_score = config.scenes[scene_index].distorted[distorted_id].scores[metric_type][scene_frame_index]
+    value = calculate_metric_score_average(metric_score.value, get_region_weights(config.scenes[scene_index], config.metrics[metric_type])) if not metric_score.skipped else None
+    for pooled_frame, completed_second in temporal_pools[(scene_index, distorted_id, metric_type)].push(scene_frame_index, value):
+        if config.output.console:
+            window = temporal_pools[(scene_index, distorted_id, metric_type)].pooling.window
+            # Seconds spanning a scene cut are reported with the scene they are stored in
+            second_scene_index, pooled_second = completed_second if completed_second is not None else (scene_index, None)
+            pool_reports = [PoolReport(scene=scene_index, distortedId=distorted_id, metric=metric_type, window=window, frame=pooled_frame, second=pooled_second)] if second_scene_index == scene_index else [
+                PoolReport(scene=scene_index, distortedId=distorted_id, metric=metric_type, window=window, frame=pooled_frame, second=None),
+                PoolReport(scene=second_scene_index, distortedId=distorted_id, metric=metric_type, window=window, frame=None, second=pooled_second),
+            ]
+            for pool_report in pool_reports:
+                if (pool_report.frame is not None or pool_report.second is not None):
+                    print(f'POOL: {serialize_pool_report(pool_report)}', flush=True)
+
+def report_frame_score(scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_index: int) -> ScoreReport:
     score_report = ScoreReport(
                 scene=scene_index,
                 distortedId=distorted_id,
@@ -939,56 +2904,616 @@ async def process_frame(compared_regions: List[List[vapoursynth.VideoNode]], sce
     if config.output.console:
         print(f'SCORE: {serialize_score_report(score_report)}', flush=True)
 
+    pool_frame_score(scene_index, distorted_id, metric_type, scene_frame_index)
+
+    if (results_database is not None):
+        results_database.add_frame_score(config, scene_index, distorted_id, metric_type, scene_frame_index)
+
     return score_report
 
+def record_frame_score(scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_index: int, results: List[Tuple[float | ButteraugliValue | VMAFValue | None, int, int]], reused: bool = False) -> ScoreReport:
+    metric_scores = initialize_metric_scores(scene_index, distorted_id, metric_type)
+    metric_scores[scene_frame_index].time = datetime.datetime.now()
+    metric_scores[scene_frame_index].skipped = None
+    metric_scores[scene_frame_index].reused = True if reused else None
+    for score, row_index, column_index in results:
+        metric_scores[scene_frame_index].value[row_index][column_index] = score
+
+    # Update MetricScore with final values
+    return report_frame_score(scene_index, distorted_id, metric_type, scene_frame_index)
+
+async def fingerprint(video: vapoursynth.VideoNode, frame_index: int, key: Tuple[Any, ...], scene_index: int) -> bytes:
+    """
+    Fingerprint a frame once, sharing the result with every metric that requests the same key while its scene is scored.
+    """
+    scene_fingerprint_keys.setdefault(scene_index, set()).add(key)
+    if (key not in frame_fingerprints):
+        def retrieve_fingerprint() -> bytes:
+            return fingerprint_frame(video.get_frame_async(frame_index).result())
+
+        frame_fingerprints[key] = create_task(to_thread(retrieve_fingerprint))
+    return await frame_fingerprints[key]
+
+async def process_frame(compared_regions: List[List[vapoursynth.VideoNode]], scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_index: int, fingerprint_videos: Tuple[vapoursynth.VideoNode, vapoursynth.VideoNode] | None = None):
+    rows = len(compared_regions)
+    columns = len(compared_regions[0])
+
+    if (fingerprint_videos is None):
+        results = await gather(*[process_region(compared_regions, scene_frame_index, row_index, column_index, metric_type) for row_index in range(rows) for column_index in range(columns)])
+        return record_frame_score(scene_index, distorted_id, metric_type, scene_frame_index, results)
+
+    scene = config.scenes[scene_index]
+    reference_fingerprint, distorted_fingerprint = await gather(
+        fingerprint(fingerprint_videos[0], scene_frame_index, ('reference', scene.reference.start + scene_frame_index), scene_index),
+        fingerprint(fingerprint_videos[1], scene_frame_index, ('distorted', distorted_id, scene.distorted[distorted_id].start + scene_frame_index), scene_index),
+    )
+    # Scenes with different regions of interest or letterbox bars, and renditions scored at different sizes, score different pixels of identical frames
+    rectangles = region_rectangles.get((scene_index, get_regions_key(config.metrics[metric_type].regions)))
+    scored_size = (distorted_map[distorted_id].width, distorted_map[distorted_id].height)
+    score_key = (metric_type, tuple(tuple(row) for row in rectangles) if rectangles is not None else None, scored_size, reference_fingerprint, distorted_fingerprint)
+
+    if (score_key in reused_scores):
+        # An identical pair of frames was or is being scored, wait for and reuse its score
+        reused_score = reused_scores[score_key] = reused_scores.pop(score_key)
+        results = await reused_score
+        return record_frame_score(scene_index, distorted_id, metric_type, scene_frame_index, results, reused=True)
+
+    reused_score = reused_scores[score_key] = get_running_loop().create_future()
+    while (len(reused_scores) > REUSED_SCORES_CAPACITY):
+        # Evict the least recently used pair, frames already waiting on it keep their reference
+        reused_scores.pop(next(iter(reused_scores)))
+    try:
+        results = await gather(*[process_region(compared_regions, scene_frame_index, row_index, column_index, metric_type) for row_index in range(rows) for column_index in range(columns)])
+    except Exception as error:
+        if (reused_scores.get(score_key) is reused_score):
+            del reused_scores[score_key]
+        reused_score.set_exception(error)
+        raise
+    reused_score.set_result(results)
+    return record_frame_score(scene_index, distorted_id, metric_type, scene_frame_index, results)
+
+async def process_frame_batch(reference_regions: List[List[vapoursynth.VideoNode]], distorted_regions: List[List[vapoursynth.VideoNode]], scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_indices: List[int]) -> List[ScoreReport]:
+    """
+    Score a batch of frames at once for metrics computed with NumPy, such as SSIM and MS-SSIM.
+
+    The luma planes of every frame in the batch are stacked so each region is filtered with a single set of array operations.
+    """
+    metric = config.metrics[metric_type]
+    rows = len(reference_regions)
+    columns = len(reference_regions[0])
+
+    def score_region(row_index: int, column_index: int) -> List[float]:
+        # Request every frame of the batch before waiting on any of them
+        reference_requests = [reference_regions[row_index][column_index].get_frame_async(scene_frame_index) for scene_frame_index in scene_frame_indices]
+        distorted_requests = [distorted_regions[row_index][column_index].get_frame_async(scene_frame_index) for scene_frame_index in scene_frame_indices]
+        reference_planes, data_range = read_luma_planes([request.result() for request in reference_requests])
+        distorted_planes, _data_range = read_luma_planes([request.result() for request in distorted_requests])
+
+        if (isinstance(metric, MSSSIMMetric)):
+            scores = calculate_ms_ssim(reference_planes, distorted_planes, data_range)
+        else:
+            scores, _contrast_structure = calculate_ssim(reference_planes, distorted_planes, data_range)
+        return [float(score) for score in scores]
+
+    region_scores = await gather(*[to_thread(score_region, row_index, column_index) for row_index in range(rows) for column_index in range(columns)])
+
+    return [
+        record_frame_score(scene_index, distorted_id, metric_type, scene_frame_index, [
+            (region_scores[row_index * columns + column_index][batch_index], row_index, column_index)
+            for row_index in range(rows)
+            for column_index in range(columns)
+        ])
+        for batch_index, scene_frame_index in enumerate(scene_frame_indices)
+    ]
+
+def is_psnr_shared_with_vmaf(scene_index: int, distorted_id: str) -> bool:
+    """
+    Whether PSNR can be extracted from the VMAF pass of a scene instead of running libvmaf again.
+    """
+    scores = config.scenes[scene_index].distorted[distorted_id].scores
+    if (MetricType.PSNR not in scores or MetricType.VMAF not in scores or not installed[Library.VMAF]):
+        return False
+
+    psnr_metric = config.metrics[MetricType.PSNR]
+    vmaf_metric = config.metrics[MetricType.VMAF]
+    return psnr_metric.proxy is None and psnr_metric.regions == vmaf_metric.regions
+
+def has_unscored_frames(scene_index: int, distorted_id: str, metric_type: MetricType) -> bool:
+    distorted_scene = config.scenes[scene_index].distorted[distorted_id]
+    metric_scores = distorted_scene.scores[metric_type]
+    return len(metric_scores) < distorted_scene.end - distorted_scene.start or any(calculate_metric_score_average(metric_score.value) is None for metric_score in metric_scores)
+
+async def process_vmaf(reference_regions: List[List[vapoursynth.VideoNode]], distorted_regions: List[List[vapoursynth.VideoNode]], scene_index: int, distorted_id: str, metric_type: MetricType, scene_frame_indices: List[int]) -> List[ScoreReport]:
+    """
+    Score every region with a single libvmaf pass over the whole scene and record the given frames.
+
+    If PSNR shares the pass, its unscored frames are recorded from the psnr_y feature as well.
+    """
+    metric: VMAFMetric = config.metrics[metric_type] # type: ignore
+    rows = len(reference_regions)
+    columns = len(reference_regions[0])
+    scene_length = reference_regions[0][0].num_frames
+    share_psnr = is_psnr_shared_with_vmaf(scene_index, distorted_id)
+    features = list(dict.fromkeys(metric.features + ([VMAFFeature.PSNR] if share_psnr else [])))
+
+    def score_region(row_index: int, column_index: int) -> Dict[int, VMAFValue]:
+        with tempfile.TemporaryDirectory(prefix='metrologist-vmaf-') as log_directory:
+            log_path = os.path.join(log_directory, 'vmaf.json')
+            compared = compare_region_vmaf(reference_regions[row_index][column_index], distorted_regions[row_index][column_index], metric, features, log_path)
+
+            # libvmaf requires frames in order, e.g. for motion features. No reference is kept to the frames so they are released at once.
+            for scene_frame_index in range(scene_length):
+                compared.get_frame(scene_frame_index)
+
+            # Free the node and any frames or cycles still referencing it so the filter is freed and the log is written
+            del compared
+            gc.collect()
+            return read_vmaf_log(log_path, metric.model, scene_length)
+
+    region_values = await gather(*[to_thread(score_region, row_index, column_index) for row_index in range(rows) for column_index in range(columns)])
+
+    score_reports = [
+        record_frame_score(scene_index, distorted_id, metric_type, scene_frame_index, [
+            (region_values[row_index * columns + column_index].get(scene_frame_index), row_index, column_index)
+            for row_index in range(rows)
+            for column_index in range(columns)
+        ])
+        for scene_frame_index in scene_frame_indices
+    ]
+
+    if (share_psnr):
+        psnr_scores = config.scenes[scene_index].distorted[distorted_id].scores[MetricType.PSNR]
+        for scene_frame_index in range(scene_length):
+            if (scene_frame_index >= len(psnr_scores) or calculate_metric_score_average(psnr_scores[scene_frame_index].value) is None):
+                score_reports.append(record_frame_score(scene_index, distorted_id, MetricType.PSNR, scene_frame_index, [
+                    (region_values[row_index * columns + column_index][scene_frame_index].features.get('psnr_y') if scene_frame_index in region_values[row_index * columns + column_index] else None, row_index, column_index)
+                    for row_index in range(rows)
+                    for column_index in range(columns)
+                ]))
+                # record_frame_score may have initialized the scores
+                psnr_scores = config.scenes[scene_index].distorted[distorted_id].scores[MetricType.PSNR]
+            else:
+                pool_frame_score(scene_index, distorted_id, MetricType.PSNR, scene_frame_index)
+
+    return score_reports
+
+def get_proxy_metric(metric_type: MetricType) -> Metric:
+    """
+    Get the metric computed by the proxy of a metric on the whole frame, with the options of the configured metric of that type if any.
+    """
+    if (metric_type not in proxy_metrics):
+        proxy_type = config.metrics[metric_type].proxy.metric or metric_type # type: ignore
+        proxy_metric = copy.copy(config.metrics[proxy_type]) if proxy_type in config.metrics else create_metric(proxy_type, {})
+        proxy_metric.regions = None # type: ignore
+        proxy_metric.proxy = None # type: ignore
+        proxy_metrics[metric_type] = proxy_metric # type: ignore
+    return proxy_metrics[metric_type]
+
+async def process_proxy(scene_index: int, distorted_id: str, metric_type: MetricType) -> set[int]:
+    """
+    Score every frame of the scene with the metric proxy and mark the frames excluded from full scoring as skipped.
+
+    Returns the indices of the frames to fully score.
+    """
+    scene = config.scenes[scene_index]
+    distorted_scene = scene.distorted[distorted_id]
+    scene_length = distorted_scene.end - distorted_scene.start
+    proxy: MetricProxy = config.metrics[metric_type].proxy # type: ignore
+    proxy_type = proxy.metric or metric_type
+    proxy_metric = get_proxy_metric(metric_type)
+
+    # The proxy is always computed on the whole frame, at the size the distorted video is scored at
+    reference_proxy = scale_video(get_reference_video(distorted_id)[scene.reference.start:scene.reference.end], proxy.scale)
+    distorted_proxy = scale_video(distorted_map[distorted_id][distorted_scene.start:distorted_scene.end], None, reference_proxy.width, reference_proxy.height)
+    compared_proxy = compare_region(reference_proxy, distorted_proxy, proxy_metric) # type: ignore
+
+    metric_scores = initialize_metric_scores(scene_index, distorted_id, metric_type)
+
+    async def process_proxy_frame(scene_frame_index: int):
+        def retrieve_frame() -> vapoursynth.VideoFrame:
+            return compared_proxy.get_frame_async(scene_frame_index).result()
+
+        frame = await to_thread(retrieve_frame)
+        metric_scores[scene_frame_index].proxy = calculate_metric_score_average([[retrieve_score(frame, proxy_metric)]]) # type: ignore
+
+    proxy_frame_size = estimate_metric_frame_size(reference_proxy, distorted_proxy, proxy_metric) # type: ignore
+    await run_jobs([
+        (proxy_frame_size, lambda scene_frame_index=scene_frame_index: process_proxy_frame(scene_frame_index))
+        for scene_frame_index in range(scene_length)
+        if metric_scores[scene_frame_index].proxy is None
+    ])
+
+    full_frames = select_proxy_frames([metric_score.proxy for metric_score in metric_scores[:scene_length]], proxy, is_higher_better(proxy_type))
+
+    for scene_frame_index in range(scene_length):
+        if (scene_frame_index not in full_frames and not metric_scores[scene_frame_index].skipped):
+            metric_scores[scene_frame_index].time = datetime.datetime.now()
+            metric_scores[scene_frame_index].skipped = True
+            report_frame_score(scene_index, distorted_id, metric_type, scene_frame_index)
+
+    return full_frames
+
 async def process_metric(scene_index: int, distorted_id: str, metric_type: MetricType):
-    tasks: List[Task[ScoreReport]] = []
+    jobs: List[Tuple[int, Callable[[], Awaitable[Any]]]] = []
     scene_length = config.scenes[scene_index].distorted[distorted_id].end - config.scenes[scene_index].distorted[distorted_id].start
     metric = config.metrics[metric_type]
+    rectangles = await plan_region_rectangles(scene_index, metric)
+
+    if (metric_type == MetricType.PSNR and is_psnr_shared_with_vmaf(scene_index, distorted_id)):
+        # PSNR is extracted from the VMAF pass of this scene
+        create_temporal_pool(scene_index, distorted_id, metric_type)
+        return
+
+    temporal_pool = create_temporal_pool(scene_index, distorted_id, metric_type)
+    full_frames = await process_proxy(scene_index, distorted_id, metric_type) if metric.proxy is not None else None
     metric_scores = config.scenes[scene_index].distorted[distorted_id].scores[metric_type]
-    rows = metric.regions.rows if metric.regions is not None else 1
-    columns = metric.regions.columns if metric.regions is not None else 1
-    reference_regions = crop_video_regions(reference_video[config.scenes[scene_index].reference.start:config.scenes[scene_index].reference.end], rows, columns)
-    distorted_regions = crop_video_regions(distorted_map[distorted_id][config.scenes[scene_index].distorted[distorted_id].start:config.scenes[scene_index].distorted[distorted_id].end], rows, columns)
-    compared_regions = [
-        [
-            compare_region(reference_regions[row_index][column_index], distorted_regions[row_index][column_index], metric) for column_index in range(columns)
+    if (rectangles is None):
+        rows = metric.regions.rows if metric.regions is not None else 1
+        columns = metric.regions.columns if metric.regions is not None else 1
+        # Inputs are converted before cropping, so regions of every metric in the same format share the conversion
+        reference_input = get_metric_input(distorted_id, metric, reference=True)
+        distorted_input = get_metric_input(distorted_id, metric)
+        reference_regions = crop_video_regions(reference_input[config.scenes[scene_index].reference.start:config.scenes[scene_index].reference.end], rows, columns)
+        distorted_regions = crop_video_regions(distorted_input[config.scenes[scene_index].distorted[distorted_id].start:config.scenes[scene_index].distorted[distorted_id].end], rows, columns)
+    else:
+        rows = len(rectangles)
+        columns = len(rectangles[0])
+        # Rectangles are planned on the reference video and scaled for renditions scored at their native resolution
+        reference_input = get_reference_video(distorted_id)
+        rectangles = scale_region_rectangles(rectangles, reference_video.width, reference_video.height, reference_input.width, reference_input.height, reference_input.format.subsampling_w, reference_input.format.subsampling_h)
+        # Regions of interest are cropped before conversion so excluded pixels are never converted
+        reference_regions = crop_video_rectangles(reference_input[config.scenes[scene_index].reference.start:config.scenes[scene_index].reference.end], rectangles)
+        distorted_regions = crop_video_rectangles(distorted_map[distorted_id][config.scenes[scene_index].distorted[distorted_id].start:config.scenes[scene_index].distorted[distorted_id].end], rectangles)
+
+    unscored_frames: List[int] = []
+    for scene_frame_index in range(scene_length):
+        if (full_frames is not None):
+            # Only fully score frames selected by the proxy that have not been fully scored yet
+            if (scene_frame_index in full_frames and (metric_scores[scene_frame_index].skipped or calculate_metric_score_average(metric_scores[scene_frame_index].value) is None)):
+                unscored_frames.append(scene_frame_index)
+            elif (temporal_pool is not None):
+                # Frame was skipped or scored in a previous run
+                pool_frame_score(scene_index, distorted_id, metric_type, scene_frame_index)
+        elif (scene_frame_index >= len(metric_scores) or metric_scores[scene_frame_index].value is None):
+            unscored_frames.append(scene_frame_index)
+        elif (temporal_pool is not None):
+            # Frame was scored in a previous run
+            pool_frame_score(scene_index, distorted_id, metric_type, scene_frame_index)
+
+    # Estimated bytes held in memory while a single frame is scored
+    frame_size = estimate_metric_frame_size(get_reference_video(distorted_id), distorted_map[distorted_id], metric)
+
+    if (isinstance(metric, VMAFMetric)):
+        if (not installed[Library.VMAF]):
+            print('VMAF requires vmaf to be installed')
+        elif (len(unscored_frames) > 0 or (is_psnr_shared_with_vmaf(scene_index, distorted_id) and has_unscored_frames(scene_index, distorted_id, MetricType.PSNR))):
+            jobs.append((frame_size, lambda: process_vmaf(reference_regions, distorted_regions, scene_index, distorted_id, metric_type, unscored_frames)))
+    elif (isinstance(metric, SSIMMetric) and numpy is not None):
+        # Score frames in batches directly from their luma planes
+        # RGB inputs are converted to luma with the matrix of the reference video
+        luma_matrix = get_luma_matrix()
+        reference_luma_regions = [[extract_luma(region, luma_matrix) for region in row] for row in reference_regions]
+        distorted_luma_regions = [[extract_luma(region, luma_matrix) for region in row] for row in distorted_regions]
+        batch_size = get_ssim_batch_size(metric, frame_size)
+        for batch_start in range(0, len(unscored_frames), batch_size):
+            batch = unscored_frames[batch_start:batch_start + batch_size]
+            jobs.append((frame_size * len(batch), lambda batch=batch: process_frame_batch(reference_luma_regions, distorted_luma_regions, scene_index, distorted_id, metric_type, batch)))
+    else:
+        compared_regions = [
+            [
+                compare_region(reference_regions[row_index][column_index], distorted_regions[row_index][column_index], metric) for column_index in range(columns)
+            ]
+            for row_index in range(rows)
         ]
-        for row_index in range(rows)
-    ]
 
-    for scene_frame_index in range(scene_length):
-        if (scene_frame_index >= len(metric_scores) or metric_scores[scene_frame_index].value is None):
-            task = create_task(process_frame(compared_regions, scene_index, distorted_id, metric_type, scene_frame_index))
-            tasks.append(task)
+        fingerprint_videos = (
+            fingerprint_video(reference_video[config.scenes[scene_index].reference.start:config.scenes[scene_index].reference.end], config.deduplication.mode, get_luma_matrix()),
+            fingerprint_video(distorted_map[distorted_id][config.scenes[scene_index].distorted[distorted_id].start:config.scenes[scene_index].distorted[distorted_id].end], config.deduplication.mode, get_luma_matrix()),
+        ) if config.deduplication is not None and not isinstance(metric, XPSNRMetric) else None
+
+        for scene_frame_index in unscored_frames:
+            jobs.append((frame_size, lambda scene_frame_index=scene_frame_index: process_frame(compared_regions, scene_index, distorted_id, metric_type, scene_frame_index, fingerprint_videos)))
 
-    await gather(*tasks)
+    await run_jobs(jobs)
 
     # Save progress
     new_json = serialize_config(config)
     with open(config.output.path or config_path, 'w') as f:
         f.write(new_json)
+    if (results_database is not None):
+        results_database.commit()
+
+async def process_scene_metric(scene_index: int, distorted_id: str, metric_type: MetricType):
+    """
+    Score a metric of a distorted video in a scene, evicting the fingerprints of the scene once its last metric has finished.
+    """
+    try:
+        await process_metric(scene_index, distorted_id, metric_type)
+    finally:
+        scene_pending_metrics[scene_index] = scene_pending_metrics[scene_index] - 1
+        if (scene_pending_metrics[scene_index] == 0):
+            for key in scene_fingerprint_keys.pop(scene_index, set()):
+                frame_fingerprints.pop(key, None)
+
+async def run_jobs(jobs: List[Tuple[int, Callable[[], Awaitable[Any]]]]):
+    """
+    Run jobs of a pipeline given as (estimated bytes in flight, job) pairs.
+
+    Without a memory budget every job runs at once. Otherwise jobs run in order on as many workers as fit the
+    budget, each waiting for the memory governor before starting.
+    """
+    if (memory_governor is None and len(y4m_streams) == 0):
+        await gather(*[create_task(job()) for _size, job in jobs]) # type: ignore
+        return
+
+    pending = deque(jobs)
+    smallest_job = min((size for size, _job in jobs), default=1)
+
+    async def worker():
+        while len(pending) > 0:
+            size, job = pending.popleft()
+            if (memory_governor is None):
+                await job()
+                continue
+
+            await memory_governor.acquire(size)
+            try:
+                await job()
+            finally:
+                await memory_governor.release(size)
+
+    # Cap the frames in flight per pipeline to what the whole budget could hold
+    workers = max(1, min(len(jobs), memory_governor.budget // max(1, smallest_job))) if memory_governor is not None else len(jobs)
+    if (len(y4m_streams) > 0):
+        # Keep the frames in flight of streamed inputs within half of the smallest ring buffer
+        workers = max(1, min(workers, min(stream.capacity for stream in y4m_streams.values()) // 2))
+    await gather(*[worker() for _ in range(workers)])
+
+def get_reference_video(distorted_id: str, video_format: vapoursynth.PresetVideoFormat | None = None) -> vapoursynth.VideoNode:
+    """
+    Get the reference video at the size a distorted video is scored at, converted to a format if given.
+    Resizing and conversion are done in a single resize, once per size and format.
+    """
+    distorted = distorted_map[distorted_id]
+    if (video_format is not None and video_format == reference_video.format.id):
+        video_format = None
+    if (video_format is None and distorted.width == reference_video.width and distorted.height == reference_video.height):
+        return reference_video
+
+    key = (distorted.width, distorted.height, int(video_format) if video_format is not None else None)
+    if (key not in reference_pyramid):
+        reference_pyramid[key] = reference_video.resize.Bicubic(width=distorted.width, height=distorted.height, format=video_format)
+    return reference_pyramid[key]
+
+def get_metric_input(distorted_id: str, metric: Metric, reference: bool = False) -> vapoursynth.VideoNode:
+    """
+    Get a distorted video, or the reference video at the size it is scored at, in the format the metric is scored in.
+    Each video is converted at most once per format so metrics in the same format share the converted frames.
+
+    Distorted videos resized on import, such as renditions of ladders scored at display resolution, are resized from the
+    imported video and converted in a single resize.
+    """
+    metric_format = get_metric_format(metric, reference_video.format, distorted_map[distorted_id].format)
+    if (reference):
+        return get_reference_video(distorted_id, metric_format)
+
+    video = distorted_map[distorted_id]
+    if (metric_format is None or metric_format == video.format.id):
+        return video
+
+    key = (distorted_id, int(metric_format))
+    if (key not in converted_videos):
+        if (distorted_id in unscaled_videos):
+            converted_videos[key] = unscaled_videos[distorted_id].resize.Bicubic(width=video.width, height=video.height, format=metric_format)
+        else:
+            converted_videos[key] = convert_video(video, metric_format)
+    return converted_videos[key]
+
+def sample_benchmark_frames(scale: float | None = None, count: int = 4) -> Tuple[vapoursynth.VideoNode, vapoursynth.VideoNode] | None:
+    """
+    Splice reference and distorted frames spread over the scenes of the first distorted video scored in any scene,
+    plus one more frame to warm up each backend, downscaled by the scale of a proxy if given.
+    Returns None if no scene scores a distorted video.
+    """
+    distorted_id = next((distorted_id for distorted_id in config.distorted if any(distorted_id in scene.distorted for scene in config.scenes)), None)
+    if (distorted_id is None):
+        return None
+
+    scenes = [scene for scene in config.scenes if distorted_id in scene.distorted]
+    reference_frames: List[vapoursynth.VideoNode] = []
+    distorted_frames: List[vapoursynth.VideoNode] = []
+    for sample_index in range(count + 1):
+        scene = scenes[sample_index * len(scenes) // (count + 1)]
+        scene_frame_index = (scene.reference.end - scene.reference.start) * (sample_index + 1) // (count + 2)
+        reference_frames.append(get_reference_video(distorted_id)[scene.reference.start + scene_frame_index])
+        distorted_frames.append(distorted_map[distorted_id][scene.distorted[distorted_id].start + scene_frame_index])
+
+    reference = scale_video(core.std.Splice(reference_frames), scale)
+    return (reference, scale_video(core.std.Splice(distorted_frames), None, reference.width, reference.height))
+
+def build_ladder_rungs(ladder: Ladder) -> List[LadderRung]:
+    """
+    Average the frame scores of every metric over every scene of each rendition of a ladder, from the highest to the lowest resolution.
+    """
+    rungs: List[LadderRung] = []
+    for distorted_id in ladder.renditions:
+        video = unscaled_videos.get(distorted_id, distorted_map[distorted_id])
+        rung = LadderRung(distortedId=distorted_id, width=video.width, height=video.height)
+        for metric_type, metric in config.metrics.items():
+            frame_scores = [
+                calculate_metric_score_average(metric_score.value, get_region_weights(scene, metric))
+                for scene in config.scenes
+                if distorted_id in scene.distorted and metric_type in scene.distorted[distorted_id].scores
+                for metric_score in scene.distorted[distorted_id].scores[metric_type]
+                if not metric_score.skipped
+            ]
+            scored_frames = [score for score in frame_scores if score is not None]
+            if (len(scored_frames) > 0):
+                rung.scores[metric_type] = sum(scored_frames) / len(scored_frames)
+        rungs.append(rung)
+
+    return sorted(rungs, key=lambda rung: rung.width * rung.height, reverse=True)
 
 async def main():
-    await gather(
-        *[
-            process_metric(scene_index, distorted_id, metric_type)
-            for scene_index in range(len(config.scenes))
-            for distorted_id in config.scenes[scene_index].distorted.keys()
-            for metric_type in config.scenes[scene_index].distorted[distorted_id].scores.keys()
-        ]
-    )
+    global memory_governor, results_database
+    if (config.memoryBudget and config.memoryBudget > 0):
+        budget = config.memoryBudget * 1024 * 1024
+        memory_governor = MemoryGovernor(budget, budget - core.max_cache_size * 1024 * 1024 - (get_resident_memory() or 0))
+
+    if (config.output.database is not None):
+        results_database = ResultsDatabase(config.output.database)
+        # Ingest frames scored in previous runs so the database matches the results
+        for scene_index, scene in enumerate(config.scenes):
+            for distorted_id, distorted in scene.distorted.items():
+                for metric_type, metric_scores in distorted.scores.items():
+                    for scene_frame_index, metric_score in enumerate(metric_scores):
+                        if (metric_score.skipped or calculate_metric_score_average(metric_score.value) is not None):
+                            results_database.add_frame_score(config, scene_index, distorted_id, metric_type, scene_frame_index)
+        results_database.commit()
+
+    # Metrics and proxies with the auto implementation are benchmarked separately, at the size each is scored at
+    benchmarks: List[Tuple[MetricType, Metric, float | None]] = []
+    for metric_type, metric in config.metrics.items():
+        benchmarks.append((metric_type, metric, None))
+        if (metric.proxy is not None):
+            benchmarks.append((metric.proxy.metric or metric_type, get_proxy_metric(metric_type), metric.proxy.scale))
+    for metric_type, metric, scale in benchmarks:
+        if (isinstance(metric, (SSIMULACRA2Metric, ButteraugliMetric)) and metric.implementation in (SSIMULACRA2Implementation.AUTO, ButteraugliImplementation.AUTO)):
+            sample_frames = sample_benchmark_frames(scale)
+            if (sample_frames is None):
+                print(f'No scene scores a distorted video to benchmark {metric_type.value} backends with, using the default backend')
+                continue
+            backend = await to_thread(select_auto_backend, metric_type, metric, *sample_frames, bool(config.output.verbose))
+            if (backend is not None):
+                selected_backends[metric] = backend
+
+    for scene_index, scene in enumerate(config.scenes):
+        scene_pending_metrics[scene_index] = sum(len(distorted.scores) for distorted in scene.distorted.values())
+
+    if (len(y4m_streams) > 0):
+        # Streamed inputs can only be read in order, so scenes are scored one after another
+        for scene_index in range(len(config.scenes)):
+            await gather(
+                *[
+                    process_scene_metric(scene_index, distorted_id, metric_type)
+                    for distorted_id in config.scenes[scene_index].distorted.keys()
+                    for metric_type in config.scenes[scene_index].distorted[distorted_id].scores.keys()
+                ]
+            )
+    else:
+        await gather(
+            *[
+                process_scene_metric(scene_index, distorted_id, metric_type)
+                for scene_index in range(len(config.scenes))
+                for distorted_id in config.scenes[scene_index].distorted.keys()
+                for metric_type in config.scenes[scene_index].distorted[distorted_id].scores.keys()
+            ]
+        )
 
-run(main())
+    # Report every rung of each ladder together
+    for ladder_id, ladder in (config.ladders or {}).items():
+        ladder.rungs[:] = build_ladder_rungs(ladder)
+        if config.output.console:
+            print(f'LADDER: {serialize_ladder_report(LadderReport(ladder_id, ladder.rungs))}', flush=True)
+
+    if (results_database is not None):
+        results_database.close()
+
+if __name__ == '__main__':
+    # Parse arguments
+    parser = argparse.ArgumentParser(prog='Multimedia Metrologist', description='Measure video quality between videos.')
+    parser.add_argument('config', help='Configuration JSON path. Can be relative to this script or a full path. Results will also be saved to this path.')
+    args = parser.parse_args()
+    config_path = str(args.config)
+
+    if (vapoursynth is None):
+        sys.exit('VapourSynth is not installed, it is required to measure videos')
+
+    # Resolve the config JSON path
+    if (not os.path.isabs(config_path)):
+        config_path = os.path.join(os.getcwd(), config_path)
+
+    # Load the configuration
+    config = deserialize_config(config_path)
+
+    # Get report on installed plugins and print to console
+    if (config.output.verbose):
+        print('Installed Plugins:')
+        for library, is_installed in installed.items():
+            print(f'  - {library.name}: {("Yes" if is_installed else "No")}')
+        print()
+
+    # Set threads if defined
+    if (config.threads and config.threads > 0):
+        core.num_threads = config.threads
+
+    # Reserve half of the memory budget for the VapourSynth frame cache, in MiB
+    if (config.memoryBudget and config.memoryBudget > 0):
+        core.max_cache_size = max(1, config.memoryBudget // 2)
+
+    # Import each video file with the respective selected importer if available
+    print(f'Importing reference video: {config.reference.path}')
+    reference_video = import_video(config.reference.path, config.reference.importMethods, max(scene.reference.end for scene in config.scenes))
+    distorted_map: Dict[str, vapoursynth.VideoNode] = {}
+
+    # Read the color properties once so every conversion uses them
+    reference_video, reference_color_properties = tag_color_properties(reference_video)
+
+    # Scale reference video if defined
+    if (config.reference.scale is not None):
+        reference_video = scale_video(reference_video, None, config.reference.scale.width, config.reference.scale.height)
+
+    # Renditions of ladders scored at native resolution are compared against the reference video downscaled to them
+    native_renditions = {distorted_id for ladder in (config.ladders or {}).values() if ladder.resolution == LadderResolution.NATIVE for distorted_id in ladder.renditions}
+
+    for key, value in config.distorted.items():
+        print(f'Importing distorted video: {value.path}')
+        distorted_map[key] = import_video(value.path, value.importMethods, max((scene.distorted[key].end for scene in config.scenes if key in scene.distorted), default=None))
+
+        # Properties missing from the distorted video are assumed to match the reference video
+        distorted_map[key], _distorted_color_properties = tag_color_properties(distorted_map[key], reference_color_properties)
+
+        # Scale distorted video if defined otherwise scale to match the dimensions of the reference video
+        unscaled_video = distorted_map[key]
+        if (value.scale is not None):
+            distorted_map[key] = scale_video(distorted_map[key], None, value.scale.width, value.scale.height)
+        elif (key not in native_renditions):
+            distorted_map[key] = scale_video(distorted_map[key], None, reference_video.width, reference_video.height)
+        if (distorted_map[key] is not unscaled_video):
+            unscaled_videos[key] = unscaled_video
+
+        # The reference video is resized to the size each distorted video is scored at, which must fit its chroma subsampling
+        if (distorted_map[key].width % (1 << reference_video.format.subsampling_w) != 0 or distorted_map[key].height % (1 << reference_video.format.subsampling_h) != 0):
+            raise ValueError(f'Distorted video input {key} is scored at {distorted_map[key].width}x{distorted_map[key].height}, which does not fit the chroma subsampling of the reference video. Set a scale that fits it for the input instead')
+
+    # Start timer for metrics comparison
+    comparison_start_time = time.time()
+    total_unscored_frames = reduce(lambda total, scene: total + count_scene_unscored_frames(scene), config.scenes, 0)
+
+    run(main())
+
+    if config.output.verbose:
+        comparison_end_time = time.time()
+        frames_per_second = (total_unscored_frames / (comparison_end_time - comparison_start_time)) if (comparison_end_time - comparison_start_time) > 0 else 0
+        print(f'[{datetime.datetime.fromtimestamp(comparison_end_time).isoformat()}] Processed {total_unscored_frames} frames in {comparison_end_time - comparison_start_time} seconds. Average FPS: ({frames_per_second:.2f} FPS)')
+        if (config.deduplication is not None):
+            reused_frame_count = sum(
+                1
+                for scene in config.scenes
+                for distorted in scene.distorted.values()
+                for metric_scores in distorted.scores.values()
+                for metric_score in metric_scores
+                if metric_score.reused
+            )
+            print(f'Reused the scores of {reused_frame_count} frames with duplicate fingerprints')
 
-if config.output.verbose:
-    comparison_end_time = time.time()
-    frames_per_second = (total_unscored_frames / (comparison_end_time - comparison_start_time)) if (comparison_end_time - comparison_start_time) > 0 else 0
-    print(f'[{datetime.datetime.fromtimestamp(comparison_end_time).isoformat()}] Processed {total_unscored_frames} frames in {comparison_end_time - comparison_start_time} seconds. Average FPS: ({frames_per_second:.2f} FPS)')
+    # Write the configuration back to the JSON file
+    new_json = serialize_config(config)
+    with open(config.output.path or config_path, 'w') as f:
+        f.write(new_json)
 
-# Write the configuration back to the JSON file
-new_json = serialize_config(config)
-with open(config.output.path or config_path, 'w') as f:
-    f.write(new_json)
+    # Export the per-region scores as a columnar file
+    if (config.output.export is not None):
+        export_results(config, config.output.export)
 
 # endregion Main
\ No newline at end of file
@@ -5,6 +5,8 @@ import {
     type MetricType,
     type Metric,
     type MetricValue,
+    type RegionOfInterest,
+    type VMAFValue,
 } from './Metric.js';
 
 /**
@@ -35,6 +37,12 @@ export interface Input<T extends 'Set' | 'Array' = 'Set'> {
          */
         height: number & tags.Type<'int32'> & tags.Minimum<1> & tags.Default<1>;
     }
+
+    /**
+     * Encoder build that produced a distorted video, used to compare builds in the results database
+     * Defaults to the distorted video identifier
+     */
+    encoder?: string;
 }
 
 /**
@@ -45,9 +53,124 @@ export interface SceneFrames {
     end: number & tags.Type<'int32'> & tags.Minimum<0>;
 }
 
-export interface SceneFrameScores<T extends MetricValue | ButteraugliValue = MetricValue> {
+export interface SceneFrameScores<T extends MetricValue | ButteraugliValue | VMAFValue = MetricValue> {
     time: Date;
     value: T[][];
+
+    /**
+     * Whole frame score of the metric proxy, if the metric has one
+     */
+    proxy?: number;
+
+    /**
+     * Whether the metric proxy excluded the frame from full scoring
+     */
+    skipped?: boolean;
+
+    /**
+     * Whether the score was reused from an earlier frame with identical reference and distorted fingerprints
+     */
+    reused?: boolean;
+}
+
+/**
+ * Aggregate of the frame scores within the sliding window ending at a frame
+ */
+export interface PooledFrame {
+    /**
+     * Index of the last frame of the window within the scene
+     */
+    frame: number & tags.Type<'int32'> & tags.Minimum<0>;
+    minimum: number;
+    maximum: number;
+    average: number;
+}
+
+/**
+ * Aggregate of the frame scores within one second of the reference video
+ */
+export interface PooledSecond {
+    /**
+     * Index of the second from the start of the reference video
+     */
+    second: number & tags.Type<'int32'> & tags.Minimum<0>;
+
+    /**
+     * Number of scored frames within the second
+     */
+    frames: number & tags.Type<'int32'> & tags.Minimum<0>;
+    average: number;
+    minimum: number;
+    maximum: number;
+}
+
+/**
+ * Temporally pooled scores of a metric for a scene
+ */
+export interface TemporalPooling {
+    /**
+     * Number of frames in the sliding window
+     */
+    window: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+    /**
+     * Sliding window aggregates for each frame whose window contains at least one scored frame, empty if `pooling.frames` is false
+     */
+    frames: PooledFrame[];
+
+    /**
+     * Aggregates of the frame scores for each second, aligned to the reference framerate
+     * A second spanning a scene cut is merged across both scenes and stored in the earlier scene
+     */
+    seconds: PooledSecond[];
+}
+
+/**
+ * Combined report of a rendition of a ladder
+ */
+export interface LadderRung {
+    /**
+     * Identifier of the distorted video input of the rendition
+     */
+    distortedId: string;
+
+    /**
+     * Width of the rendition as imported
+     */
+    width: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+    /**
+     * Height of the rendition as imported
+     */
+    height: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+    /**
+     * Average frame score of each metric over every scene of the rendition, excluding frames skipped by a metric proxy
+     */
+    scores: Partial<Record<MetricType, number>>;
+}
+
+/**
+ * Renditions of an adaptive bitrate ladder scored against the same reference video
+ */
+export interface Ladder {
+    /**
+     * Identifiers of the distorted video inputs of the ladder
+     */
+    renditions: string[] & tags.MinItems<1> & tags.UniqueItems;
+
+    /**
+     * Resolution to score each rendition at
+     * `native` scores each rendition at its own resolution against the reference video downscaled to it
+     * `display` scores each rendition upscaled to the resolution of the reference video
+     * @default 'display'
+     */
+    resolution?: 'native' | 'display';
+
+    /**
+     * Combined report of every rendition from the highest to the lowest resolution, recomputed on each run
+     */
+    rungs?: LadderRung[];
 }
 
 /**
@@ -58,8 +181,20 @@ export interface Scene {
     distorted: {
         [id: string]: SceneFrames & {
             scores: Partial<Record<MetricType, SceneFrameScores[]>>;
+            pooling?: Partial<Record<MetricType, TemporalPooling>>;
         };
     };
+
+    /**
+     * Rectangles to compute every metric on in this scene, replacing the regions of each metric
+     */
+    rois?: RegionOfInterest[] & tags.MinItems<1>;
+
+    /**
+     * Picture area of the reference video without letterbox and pillarbox bars, detected once for metrics with letterbox detection
+     * Regions of interest entirely outside of it have a weight of 0
+     */
+    letterbox?: RegionOfInterest;
 }
 
 /**
@@ -83,6 +218,29 @@ export interface Output {
      * @default false
      */
     verbose?: boolean & tags.Default<false>;
+
+    /**
+     * Columnar export of the per-frame, per-region scores
+     * One row per region of a frame and one column per metric, norm, or VMAF feature
+     */
+    export?: {
+        /**
+         * Path of the exported file
+         */
+        path: string;
+
+        /**
+         * File format
+         * Defaults to the format matching the file extension (`.parquet`, `.npy`) or `arrow`
+         * `arrow` and `parquet` require PyArrow and fall back to `npy` when it is not installed
+         */
+        format?: 'arrow' | 'parquet' | 'npy';
+    };
+
+    /**
+     * Path of a SQLite database that accumulates frame scores across runs
+     */
+    database?: string;
 }
 
 export interface Configuration<T extends 'Set' | 'Array' = 'Set'> {
@@ -127,4 +285,50 @@ export interface Configuration<T extends 'Set' | 'Array' = 'Set'> {
      * @minimum 1
      */
     threads?: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+    /**
+     * Memory budget in MiB
+     * Half of the budget is reserved for the VapourSynth frame cache and the rest limits the frames in flight,
+     * adapting to the measured memory usage of the process
+     * Defaults to no limit
+     * @minimum 1
+     */
+    memoryBudget?: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+    /**
+     * Reuse metric scores for frames whose reference and distorted fingerprints match an earlier scored frame
+     */
+    deduplication?: {
+        /**
+         * How frames are fingerprinted
+         * `exact` hashes every plane at full resolution
+         * `luma` hashes the luma plane downscaled to 64x64 at 8 bits, which also matches nearly identical frames
+         * @default 'exact'
+         */
+        mode?: 'exact' | 'luma';
+    };
+
+    /**
+     * Adaptive bitrate ladders, each grouping distorted video inputs that are renditions of the reference video
+     */
+    ladders?: {
+        [id: string]: Ladder;
+    };
+
+    /**
+     * Temporal pooling of frame scores, computed as frames are scored
+     */
+    pooling?: {
+        /**
+         * Number of frames in the sliding window
+         * Defaults to one second of frames at the reference framerate
+         */
+        window?: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+        /**
+         * Whether to store the sliding window aggregates of every frame in addition to the per-second aggregates
+         * @default true
+         */
+        frames?: boolean;
+    };
 }
\ No newline at end of file
@@ -5,9 +5,10 @@ export const ImportMethodType = {
     LSMASH: 'lsmash',
     DGDecNV: 'dgdecnv',
     BestSource: 'bestsource',
+    Y4M: 'y4m',
 } as const;
 
-export type ImportMethod = FFMS2Import | LSMASHImport | DGDecNVImport | BestSourceImport;
+export type ImportMethod = FFMS2Import | LSMASHImport | DGDecNVImport | BestSourceImport | Y4MImport;
 
 //#region FFMS2
 
@@ -511,4 +512,29 @@ export interface BestSourceImport {
     showprogress?: boolean & tags.Default<false>;
 }
 
-//#endregion BestSource
\ No newline at end of file
+//#endregion BestSource
+
+//#region Y4M
+
+/**
+ * YUV4MPEG2 stream import method configuration
+ * Reads frames in order from stdin (`-`), a FIFO, or a TCP socket (`tcp://host:port`) while they are produced
+ */
+export interface Y4MImport {
+
+    type: typeof ImportMethodType.Y4M;
+
+    /**
+     * The number of frames in the stream.
+     * Defaults to the end of the last scene of the input.
+     */
+    frames?: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+    /**
+     * The number of frames held in memory.
+     * @default 120
+     */
+    buffer?: number & tags.Type<'int32'> & tags.Minimum<2> & tags.Default<120>;
+}
+
+//#endregion Y4M
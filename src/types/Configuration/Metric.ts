@@ -15,6 +15,8 @@ export enum MetricType {
     VMAF = 'VMAF',
     Butteraugli = 'Butteraugli',
     XPSNR = 'XPSNR',
+    SSIM = 'SSIM',
+    MS_SSIM = 'MS-SSIM',
 }
 
 /**
@@ -37,16 +39,86 @@ export type Metric<T extends keyof typeof MetricType | undefined = undefined> =
     ? ButteraugliMetric
     : T extends typeof MetricType.XPSNR
     ? XPSNRMetric
+    : T extends typeof MetricType.SSIM
+    ? SSIMMetric
+    : T extends typeof MetricType.MS_SSIM
+    ? MSSSIMMetric
     : BaseMetric;
 
 export type MetricValue = (number & tags.Type<'float'>);
 export type ButteraugliValue = { Norm2: (number & tags.Type<'float'> & tags.Minimum<0>); Norm3: (number & tags.Type<'float'> & tags.Minimum<0>); NormInfinite: (number & tags.Type<'float'> & tags.Minimum<0>); };
 
+/**
+ * Cheap first pass used to select which frames are scored with the full metric
+ */
+export interface MetricProxy {
+    /**
+     * Metric to compute in the first pass. Defaults to the metric itself.
+     * The metric itself requires a `scale` below 1, otherwise every frame would be scored twice.
+     * VMAF cannot be a proxy, including as the default proxy of a VMAF metric.
+     */
+    metric?: MetricType;
+
+    /**
+     * Factor to downscale the reference and distorted inputs by for the first pass
+     */
+    scale?: number & tags.Type<'float'> & tags.ExclusiveMinimum<0> & tags.Maximum<1>;
+
+    /**
+     * Frames with a first pass score worse than this value are fully scored
+     */
+    threshold?: number & tags.Type<'float'>;
+
+    /**
+     * Percentage of frames with the worst first pass scores that are fully scored
+     */
+    worst?: number & tags.Type<'float'> & tags.Minimum<0> & tags.Maximum<100>;
+}
+
+/**
+ * Rectangle of the frame to compute a metric on, in pixels of the reference video after scaling
+ */
+export interface RegionOfInterest {
+    left: number & tags.Type<'int32'> & tags.Minimum<0>;
+    top: number & tags.Type<'int32'> & tags.Minimum<0>;
+    width: number & tags.Type<'int32'> & tags.Minimum<1>;
+    height: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+    /**
+     * Weight of the rectangle when averaging the regions of a frame
+     * @default 1
+     */
+    weight?: number & tags.Type<'float'> & tags.Minimum<0>;
+}
+
 export interface BaseMetric {
     regions?: {
-        rows: number & tags.Type<'int32'> & tags.Minimum<1>;
-        columns: number & tags.Type<'int32'> & tags.Minimum<1>;
+        /**
+         * @default 1
+         */
+        rows?: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+        /**
+         * @default 1
+         */
+        columns?: number & tags.Type<'int32'> & tags.Minimum<1>;
+
+        /**
+         * Rectangles to compute instead of the grid, scored as a single row with one column per rectangle
+         */
+        rois?: RegionOfInterest[] & tags.MinItems<1>;
+
+        /**
+         * Detect letterbox and pillarbox bars on the reference video of each scene and exclude them from the grid or rectangles
+         * @default false
+         */
+        letterbox?: boolean & tags.Default<false>;
     };
+
+    /**
+     * Score every frame with a cheap first pass and only fully score the frames it flags
+     */
+    proxy?: MetricProxy;
 }
 
 export type PSNRMetric = BaseMetric;
@@ -56,27 +128,63 @@ export const SSIMULACRA2Implementation = {
     CUDA: 'cuda',
     HIP: 'hip',
     CPU: 'cpu',
+    AUTO: 'auto',
 } as const;
 
 export interface SSIMULACRA2Metric extends BaseMetric {
     /**
-     * Implementation to use. Can be 'cuda', 'hip', or 'cpu'. If 'cuda' or 'hip' is unavailable, 'cpu' will be used.
+     * Implementation to use. Can be 'cuda', 'hip', 'cpu', or 'auto'. If 'cuda' or 'hip' is unavailable, 'cpu' will be used.
+     * 'auto' benchmarks every installed plugin at startup and uses the fastest one whose scores agree with the others.
      * @enum {SSIMULACRA2Implementation}
      */
     implementation?: typeof SSIMULACRA2Implementation[keyof typeof SSIMULACRA2Implementation];
 }
 
-export type VMAFMetric = BaseMetric;
+export const VMAFModel = {
+    VMAF_V061: 'vmaf_v0.6.1',
+    VMAF_V061_NEG: 'vmaf_v0.6.1neg',
+    VMAF_B_V063: 'vmaf_b_v0.6.3',
+    VMAF_4K_V061: 'vmaf_4k_v0.6.1',
+} as const;
+
+export const VMAFFeature = {
+    PSNR: 'psnr',
+    PSNR_HVS: 'psnr_hvs',
+    SSIM: 'ssim',
+    MS_SSIM: 'ms_ssim',
+    CIEDE2000: 'ciede2000',
+} as const;
+
+/**
+ * VMAF score of a region and the per-frame values of every feature libvmaf reported, such as `integer_vif_scale0`, `integer_adm2`, `integer_motion2`, `psnr_y`, or `float_ssim`
+ */
+export type VMAFValue = { score: (number & tags.Type<'float'>); features: Record<string, number & tags.Type<'float'>>; };
+
+export interface VMAFMetric extends BaseMetric {
+    /**
+     * Model to score with.
+     * @default 'vmaf_v0.6.1'
+     */
+    model?: typeof VMAFModel[keyof typeof VMAFModel];
+
+    /**
+     * Additional features to compute in the same libvmaf pass, such as PSNR or SSIM.
+     * If PSNR is also measured with the same regions, it is extracted from the same pass automatically.
+     */
+    features?: (typeof VMAFFeature[keyof typeof VMAFFeature])[] & tags.UniqueItems;
+}
 
 export const ButteraugliImplementation = {
     CUDA: 'cuda',
     HIP: 'hip',
     CPU: 'cpu',
+    AUTO: 'auto',
 } as const;
 
 export interface ButteraugliMetric extends BaseMetric {
     /**
-     * Implementation to use. Can be 'cuda', 'hip', or 'cpu'. If 'cuda' or 'hip' is unavailable, 'cpu' will be used.
+     * Implementation to use. Can be 'cuda', 'hip', 'cpu', or 'auto'. If 'cuda' or 'hip' is unavailable, 'cpu' will be used.
+     * 'auto' benchmarks every installed plugin at startup and uses the fastest one whose scores agree with the others.
      * @enum {ButteraugliImplementation}
      */
     implementation?: typeof ButteraugliImplementation[keyof typeof ButteraugliImplementation];
@@ -96,3 +204,13 @@ export interface ButteraugliMetric extends BaseMetric {
 }
 
 export type XPSNRMetric = BaseMetric;
+
+export interface SSIMMetric extends BaseMetric {
+    /**
+     * Number of frames to score per call. Computed with NumPy without any VapourSynth plugin.
+     * Defaults to up to 8 frames whose arrays fit in 256 MiB, and is limited to the memory budget.
+     */
+    batch?: number & tags.Type<'int32'> & tags.Minimum<1>;
+}
+
+export type MSSSIMMetric = SSIMMetric;
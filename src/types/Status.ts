@@ -1,3 +1,8 @@
+import {
+    type LadderRung,
+    type PooledFrame,
+    type PooledSecond,
+} from './Configuration/Configuration.js';
 import { type MetricType } from './Configuration/Metric.js';
 
 export const State = {
@@ -46,6 +51,26 @@ export interface ErrorStatus extends BaseStatus {
     error: Error;
 }
 
+/**
+ * Temporally pooled scores emitted as frames of a scene are scored in order
+ */
+export interface PoolingReport {
+    sceneIndex: number;
+    distortedId: string;
+    metric: MetricType;
+    window: number;
+    frame?: PooledFrame;
+    second?: PooledSecond;
+}
+
+/**
+ * Combined report of every rung of a ladder, emitted once every frame is scored
+ */
+export interface LadderReport {
+    ladderId: string;
+    rungs: LadderRung[];
+}
+
 export interface MetrologistEvent {
     status: Status[];
     idle: IdleStatus[];
@@ -54,4 +79,6 @@ export interface MetrologistEvent {
     done: DoneStatus[];
     canceled: CanceledStatus[];
     error: ErrorStatus[];
+    pooling: PoolingReport[];
+    ladder: LadderReport[];
 };
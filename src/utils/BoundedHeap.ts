@@ -0,0 +1,79 @@
+/**
+ * Fixed capacity binary heap which keeps the greatest items by a comparison, dropping the least item once full
+ */
+export class BoundedHeap<T> implements Iterable<T> {
+    private readonly items: T[] = [];
+
+    constructor(public readonly capacity: number, private readonly compare: (a: T, b: T) => number) {
+        if (!Number.isInteger(capacity) || capacity < 1) {
+            throw new RangeError(`Bounded heap capacity must be a positive integer, received ${capacity}`);
+        }
+    }
+
+    public get length() {
+        return this.items.length;
+    }
+
+    /**
+     * Add an item, replacing the least item when the heap is full and the item is greater
+     * @returns The number of items in the heap
+     */
+    public push(item: T) {
+        if (this.items.length < this.capacity) {
+            this.items.push(item);
+            this.siftUp(this.items.length - 1);
+        } else if (this.compare(item, this.items[0] as T) > 0) {
+            this.items[0] = item;
+            this.siftDown(0);
+        }
+
+        return this.items.length;
+    }
+
+    /**
+     * Items sorted in ascending order
+     */
+    public toSortedArray() {
+        return this.items.slice().sort(this.compare);
+    }
+
+    public *[Symbol.iterator]() {
+        yield* this.items;
+    }
+
+    private siftUp(index: number) {
+        while (index > 0) {
+            const parent = (index - 1) >> 1;
+            if (this.compare(this.items[index] as T, this.items[parent] as T) >= 0) {
+                return;
+            }
+            this.swap(index, parent);
+            index = parent;
+        }
+    }
+
+    private siftDown(index: number) {
+        for (;;) {
+            const left = index * 2 + 1;
+            const right = left + 1;
+            let least = index;
+            if (left < this.items.length && this.compare(this.items[left] as T, this.items[least] as T) < 0) {
+                least = left;
+            }
+            if (right < this.items.length && this.compare(this.items[right] as T, this.items[least] as T) < 0) {
+                least = right;
+            }
+            if (least === index) {
+                return;
+            }
+            this.swap(index, least);
+            index = least;
+        }
+    }
+
+    private swap(a: number, b: number) {
+        const item = this.items[a] as T;
+        this.items[a] = this.items[b] as T;
+        this.items[b] = item;
+    }
+}
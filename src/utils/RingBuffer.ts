@@ -0,0 +1,67 @@
+/**
+ * Fixed capacity buffer which keeps the most recent items, overwriting the oldest item once full
+ */
+export class RingBuffer<T> implements Iterable<T> {
+    private readonly items: (T | undefined)[];
+    private start = 0;
+    private count = 0;
+
+    constructor(public readonly capacity: number, items: Iterable<T> = []) {
+        if (!Number.isInteger(capacity) || capacity < 1) {
+            throw new RangeError(`Ring buffer capacity must be a positive integer, received ${capacity}`);
+        }
+
+        this.items = new Array(capacity);
+        for (const item of items) {
+            this.push(item);
+        }
+    }
+
+    public get length() {
+        return this.count;
+    }
+
+    /**
+     * Add an item, dropping the oldest item when the buffer is full
+     * @returns The number of items in the buffer
+     */
+    public push(item: T) {
+        if (this.count < this.capacity) {
+            this.items[(this.start + this.count) % this.capacity] = item;
+            this.count++;
+        } else {
+            this.items[this.start] = item;
+            this.start = (this.start + 1) % this.capacity;
+        }
+
+        return this.count;
+    }
+
+    /**
+     * Item at an index from the oldest item, or from the newest item when negative
+     */
+    public at(index: number) {
+        const position = index < 0 ? this.count + index : index;
+        if (position < 0 || position >= this.count) {
+            return undefined;
+        }
+
+        return this.items[(this.start + position) % this.capacity];
+    }
+
+    public clear() {
+        this.items.fill(undefined);
+        this.start = 0;
+        this.count = 0;
+    }
+
+    public toArray() {
+        return Array.from(this);
+    }
+
+    public *[Symbol.iterator]() {
+        for (let position = 0; position < this.count; position++) {
+            yield this.items[(this.start + position) % this.capacity] as T;
+        }
+    }
+}
@@ -0,0 +1,167 @@
+import {
+    MetricType,
+    type MetricValue,
+    type ButteraugliValue,
+    type VMAFValue,
+} from '../types/Configuration/Metric.js';
+
+/**
+ * Summary of a running statistics aggregate
+ */
+export interface StatisticsSummary {
+    count: number;
+    average: number;
+    minimum: number;
+    maximum: number;
+    variance: number;
+    standardDeviation: number;
+}
+
+/**
+ * Summary of every score of a sequence, including the scores themselves, the median, and the 1st and 5th percentiles
+ */
+export interface ScoreStatisticsSummary extends StatisticsSummary {
+    scores: number[];
+    median: number;
+    percentile1: number;
+    percentile5: number;
+}
+
+/**
+ * Count, average, minimum, maximum, and variance of a sequence of scores updated one score at a time in constant memory using Welford's algorithm
+ */
+export class RunningStatistics {
+    private total = 0;
+    private mean = 0;
+    private squaredDifferences = 0;
+    private lowest = Infinity;
+    private highest = -Infinity;
+
+    public static From(scores: Iterable<number>) {
+        const statistics = new RunningStatistics();
+        for (const score of scores) {
+            statistics.add(score);
+        }
+
+        return statistics;
+    }
+
+    public get count() {
+        return this.total;
+    }
+
+    public get average() {
+        return this.total ? this.mean : NaN;
+    }
+
+    public get minimum() {
+        return this.lowest;
+    }
+
+    public get maximum() {
+        return this.highest;
+    }
+
+    /**
+     * Population variance, matching the standard deviation of every score rather than of a sample
+     */
+    public get variance() {
+        return this.total ? this.squaredDifferences / this.total : NaN;
+    }
+
+    public get standardDeviation() {
+        return Math.sqrt(this.variance);
+    }
+
+    public add(score: number) {
+        this.total++;
+        const difference = score - this.mean;
+        this.mean += difference / this.total;
+        this.squaredDifferences += difference * (score - this.mean);
+        this.lowest = Math.min(this.lowest, score);
+        this.highest = Math.max(this.highest, score);
+
+        return this;
+    }
+
+    /**
+     * Combine the scores of another aggregate into this one (Chan et al.)
+     */
+    public merge(other: RunningStatistics) {
+        if (!other.total) {
+            return this;
+        }
+
+        const total = this.total + other.total;
+        const difference = other.mean - this.mean;
+        this.squaredDifferences += other.squaredDifferences + difference * difference * this.total * other.total / total;
+        this.mean += difference * other.total / total;
+        this.total = total;
+        this.lowest = Math.min(this.lowest, other.lowest);
+        this.highest = Math.max(this.highest, other.highest);
+
+        return this;
+    }
+
+    public toJSON(): StatisticsSummary {
+        return {
+            count: this.count,
+            average: this.average,
+            minimum: this.minimum,
+            maximum: this.maximum,
+            variance: this.variance,
+            standardDeviation: this.standardDeviation,
+        };
+    }
+}
+
+/**
+ * Summarize running statistics with the scores they aggregated, which are only sorted here for the median and percentiles
+ */
+export function summarizeScores(statistics: RunningStatistics, scores: number[]): ScoreStatisticsSummary {
+    const sortedScores = scores.slice().sort((a, b) => a - b);
+
+    return {
+        ...statistics.toJSON(),
+        scores,
+        median: calculatePercentile(sortedScores, 50),
+        percentile1: calculatePercentile(sortedScores, 1),
+        percentile5: calculatePercentile(sortedScores, 5),
+    };
+}
+
+/**
+ * Linearly interpolated percentile of scores sorted in ascending order
+ */
+export function calculatePercentile(sortedScores: number[], percentile: number) {
+    const index = (percentile / 100) * (sortedScores.length - 1);
+    const lowerIndex = Math.floor(index);
+    const upperIndex = Math.ceil(index);
+    const lower = sortedScores[lowerIndex] ?? 0;
+    const upper = sortedScores[upperIndex] ?? 0;
+    return lowerIndex === upperIndex ? lower : lower + (upper - lower) * (index - lowerIndex);
+}
+
+/**
+ * Average of the region scores of a frame, weighted by the regions of interest when there is a weight for every region
+ */
+export function calculateFrameScore(metric: MetricType, value: MetricValue[][] | ButteraugliValue[][] | VMAFValue[][], weights?: number[]) {
+    if (!Array.isArray(value)) {
+        return value as number;
+    }
+
+    const regionScores = (value as (MetricValue | ButteraugliValue | VMAFValue)[][]).flat();
+    // Regions are weighted equally when every weight is 0
+    const regionWeights = weights?.length === regionScores.length && weights.some(weight => weight > 0) ? weights : regionScores.map(() => 1);
+    return regionScores.reduce<number>((sum, regionScore, index) => {
+        const weight = regionWeights[index] ?? 1;
+        if (metric === MetricType.Butteraugli) {
+            // Default to using NormInfinite - Consider using Norm2 when metric implementation is HIP/CUDA
+            return sum + (regionScore as ButteraugliValue).NormInfinite * weight;
+        }
+        if (metric === MetricType.VMAF) {
+            return sum + (regionScore as VMAFValue).score * weight;
+        }
+        return sum + (regionScore as MetricValue) * weight;
+    }, 0) / regionWeights.reduce((sum, weight) => sum + weight, 0);
+}